@@ -1,3 +1,14 @@
 from .logger import Logger
-from .dashboard import Dashboard
-from .utils import compare_fns
\ No newline at end of file
+from .utils import compare_fns
+from . import aggregators
+
+__all__ = ["Logger", "Dashboard", "compare_fns", "aggregators"]
+
+
+def __getattr__(name):
+    # Dashboard pulls in pandas and the plotting stack, only load it when used
+    if name == "Dashboard":
+        from .dashboard import Dashboard
+
+        return Dashboard
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,281 @@
+from typing import Optional
+import os
+
+import numpy as np
+
+from .sketches import TDigest
+from .utils import read_file
+
+
+AGGREGATES_FILE = "aggregates"
+
+
+class Aggregator:
+    """
+    Streaming summary of a value series.
+
+    Aggregators are updated with whole batches of values and their steps,
+    can be merged with another aggregator of the same kind, e.g. from another
+    shard, and round-trip through ``state()``/``from_state()`` so they can be
+    persisted with the experiment. NaN values, e.g. logged Nones, are
+    skipped by every aggregator.
+    """
+
+    name = None
+
+    def update(self, values: np.ndarray, steps: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def merge(self, other: "Aggregator") -> None:
+        raise NotImplementedError
+
+    def result(self) -> dict:
+        """
+        Returns the summary values keyed by the label they are shown under.
+        """
+        raise NotImplementedError
+
+    def state(self) -> dict:
+        return {"type": self.name, **vars(self)}
+
+    @staticmethod
+    def from_state(state: dict) -> "Aggregator":
+        return AGGREGATORS[state["type"]]._from_state(state)
+
+    @classmethod
+    def _from_state(cls, state: dict) -> "Aggregator":
+        aggregator = object.__new__(cls)
+        vars(aggregator).update({k: v for k, v in state.items() if k != "type"})
+        return aggregator
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.result()})"
+
+
+class Count(Aggregator):
+    name = "count"
+
+    def __init__(self):
+        self.count = 0
+
+    def update(self, values, steps):
+        self.count += int(np.count_nonzero(~np.isnan(values)))
+
+    def merge(self, other):
+        self.count += other.count
+
+    def result(self):
+        return {"count": self.count}
+
+
+class Sum(Aggregator):
+    name = "sum"
+
+    def __init__(self):
+        self.sum = 0.0
+
+    def update(self, values, steps):
+        self.sum += float(np.nansum(values))
+
+    def merge(self, other):
+        self.sum += other.sum
+
+    def result(self):
+        return {"sum": self.sum}
+
+
+class Mean(Aggregator):
+    name = "mean"
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+
+    def update(self, values, steps):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self._combine(int(len(values)), float(np.mean(values)))
+
+    def merge(self, other):
+        if other.count:
+            self._combine(other.count, other.mean)
+
+    def _combine(self, count, mean):
+        total = self.count + count
+        if self.mean is None:
+            self.mean = mean
+        else:
+            self.mean += (mean - self.mean) * count / total
+        self.count = total
+
+    def result(self):
+        return {"mean": self.mean}
+
+
+class EMA(Aggregator):
+    """
+    Exponential moving average, ``ema = (1 - alpha) * ema + alpha * value``.
+    Merging keeps the average of whichever series reached the later step, as
+    averages over separately ordered streams do not combine.
+    """
+
+    name = "ema"
+
+    def __init__(self, alpha: float = 0.1):
+        assert 0 < alpha <= 1, f"Invalid alpha: {alpha}"
+        self.alpha = alpha
+        self.ema = None
+        self.step = None
+
+    def update(self, values, steps):
+        values = np.asarray(values, dtype=float)
+        present = ~np.isnan(values)
+        values, steps = values[present], np.asarray(steps, dtype=float)[present]
+        if not len(values):
+            return
+        if self.ema is None:
+            self.ema, values = float(values[0]), values[1:]
+        decay = 1 - self.alpha
+        weights = self.alpha * decay ** np.arange(len(values) - 1, -1, -1)
+        self.ema = float(decay ** len(values) * self.ema + weights @ values)
+        if len(steps) and not np.isnan(steps[-1]):
+            self.step = float(steps[-1])
+
+    def merge(self, other):
+        if other.ema is None:
+            return
+        later = other.step is not None and (
+            self.step is None or other.step > self.step
+        )
+        if self.ema is None or later:
+            self.ema, self.step = other.ema, other.step
+
+    def result(self):
+        return {"ema": self.ema}
+
+
+class _ArgBest(Aggregator):
+    # Shared by ArgMax/ArgMin, keeps the best value and the step it was at
+    sign = None
+
+    def __init__(self):
+        self.value = None
+        self.step = None
+
+    def update(self, values, steps):
+        values = np.asarray(values, dtype=float)
+        if not len(values) or np.isnan(values).all():
+            return
+        i = int(np.nanargmax(self.sign * values))
+        step = None if np.isnan(steps[i]) else int(steps[i])
+        self._combine(float(values[i]), step)
+
+    def merge(self, other):
+        if other.value is not None:
+            self._combine(other.value, other.step)
+
+    def _combine(self, value, step):
+        if self.value is None or self.sign * value > self.sign * self.value:
+            self.value, self.step = value, step
+
+    def result(self):
+        return {self.name: self.step}
+
+
+class ArgMax(_ArgBest):
+    name = "argmax"
+    sign = 1
+
+
+class ArgMin(_ArgBest):
+    name = "argmin"
+    sign = -1
+
+
+class Quantiles(Aggregator):
+    """
+    Quantiles estimated with a mergeable t-digest sketch, shown as e.g.
+    ``p50``/``p95``/``p99``.
+    """
+
+    name = "quantiles"
+
+    def __init__(self, quantiles=(0.5, 0.95, 0.99), compression: float = 100):
+        self.quantiles = list(quantiles)
+        self.digest = TDigest(compression=compression)
+
+    def update(self, values, steps):
+        self.digest.update(values)
+
+    def merge(self, other):
+        self.digest.merge(other.digest)
+
+    def result(self):
+        estimates = np.atleast_1d(self.digest.quantile(self.quantiles))
+        return {
+            f"p{100 * q:g}": None if np.isnan(v) else float(v)
+            for q, v in zip(self.quantiles, estimates)
+        }
+
+    def state(self):
+        return {
+            "type": self.name,
+            "quantiles": self.quantiles,
+            "digest": self.digest.state(),
+        }
+
+    @classmethod
+    def _from_state(cls, state):
+        aggregator = object.__new__(cls)
+        aggregator.quantiles = list(state["quantiles"])
+        aggregator.digest = TDigest.from_state(state["digest"])
+        return aggregator
+
+
+AGGREGATORS = {
+    aggregator.name: aggregator
+    for aggregator in [Count, Sum, Mean, EMA, ArgMax, ArgMin, Quantiles]
+}
+
+
+def load_aggregates(paths: list, serializer) -> dict:
+    """
+    Loads and merges the aggregator states persisted under several paths,
+    e.g. an experiment and its shards.
+
+    Args:
+        paths (list): Directories holding an aggregates file.
+        serializer: The serializer the experiment was logged with.
+
+    Returns:
+        dict: The merged aggregators per key.
+    """
+    aggregates = {}
+    for path in paths:
+        file = os.path.join(path, f"{AGGREGATES_FILE}{serializer.extension}")
+        if not os.path.isfile(file):
+            continue
+        for key, states in (read_file(file, serializer) or {}).items():
+            merged = aggregates.setdefault(key, {})
+            for state in states:
+                aggregator = Aggregator.from_state(state)
+                if aggregator.name in merged:
+                    merged[aggregator.name].merge(aggregator)
+                else:
+                    merged[aggregator.name] = aggregator
+    return {key: list(merged.values()) for key, merged in aggregates.items()}
+
+
+def aggregate_results(aggregates: dict, values: Optional[dict] = None) -> dict:
+    """
+    Adds the results of the aggregators of every key to a values summary as
+    ``<label>_<key>``.
+    """
+    values = {} if values is None else values
+    for key, aggregators in aggregates.items():
+        for aggregator in aggregators:
+            for label, result in aggregator.result().items():
+                values[f"{label}_{key}"] = result
+    return values
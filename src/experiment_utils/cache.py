@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from typing import Callable, Optional, Sequence
+import hashlib
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+
+class SeriesCache:
+    """
+    In-process cache of parsed series records with LRU eviction.
+
+    Entries are keyed by the files a series was parsed from together with
+    their modification time and size, so a series is reparsed as soon as any
+    of its files changes. With a ``disk_path`` the parsed records are also
+    kept as ``.npz`` files there and survive interpreter restarts.
+
+    Args:
+        max_bytes (int, optional): Memory budget for cached records. The least
+            recently used series are evicted beyond it.
+        disk_path (str, optional): Directory for the on-disk cache.
+    """
+
+    def __init__(self, max_bytes: int = 256 << 20, disk_path: Optional[str] = None):
+        assert max_bytes >= 0, f"Invalid cache size: {max_bytes}"
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self.num_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, files: Sequence[str], load: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        Returns the records parsed from ``files``, calling ``load`` to parse
+        them only when no up to date copy is cached.
+        """
+        files = tuple(files)
+        signature = tuple(
+            (stat.st_mtime_ns, stat.st_size) for stat in map(os.stat, files)
+        )
+        with self._lock:
+            entry = self._entries.get(files)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(files)
+                return entry[1]
+
+        records = self._read_disk(files, signature)
+        if records is None:
+            records = np.array(load())
+            self._write_disk(files, signature, records)
+        # Cached records are shared by every caller
+        records.flags.writeable = False
+        self._put(files, signature, records)
+        return records
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.num_bytes = 0
+        if self.disk_path is not None and os.path.isdir(self.disk_path):
+            for name in os.listdir(self.disk_path):
+                if name.endswith(".npz"):
+                    os.remove(os.path.join(self.disk_path, name))
+
+    def _put(self, files, signature, records) -> None:
+        with self._lock:
+            entry = self._entries.pop(files, None)
+            if entry is not None:
+                self.num_bytes -= entry[1].nbytes
+            if records.nbytes > self.max_bytes:
+                return
+            self._entries[files] = (signature, records)
+            self.num_bytes += records.nbytes
+            while self.num_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.num_bytes -= evicted.nbytes
+
+    def _disk_file(self, files) -> str:
+        digest = hashlib.sha1("\0".join(map(os.path.abspath, files)).encode())
+        return os.path.join(self.disk_path, f"{digest.hexdigest()}.npz")
+
+    def _read_disk(self, files, signature) -> Optional[np.ndarray]:
+        if self.disk_path is None:
+            return None
+        file = self._disk_file(files)
+        if not os.path.isfile(file):
+            return None
+        with np.load(file) as data:
+            # A stale copy is overwritten once the series is parsed again
+            if data["signature"].tolist() != [list(s) for s in signature]:
+                return None
+            return data["records"]
+
+    def _write_disk(self, files, signature, records) -> None:
+        # Values other than numbers could only be stored pickled
+        if self.disk_path is None or records.dtype.hasobject:
+            return
+        if not os.path.isdir(self.disk_path):
+            os.makedirs(self.disk_path, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.disk_path, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f, records=records, signature=np.array(signature, dtype=np.int64)
+            )
+        os.replace(tmp, self._disk_file(files))
+
+    def __getstate__(self):
+        # Worker processes start from an empty cache but share the disk cache
+        return {"max_bytes": self.max_bytes, "disk_path": self.disk_path}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __repr__(self):
+        return (
+            f"SeriesCache(entries={len(self._entries)}, num_bytes={self.num_bytes}, "
+            f"max_bytes={self.max_bytes})"
+        )
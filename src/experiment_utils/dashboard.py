@@ -1,113 +1,785 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+import copy
 import os
-import yaml
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
-from bokeh.plotting import figure, show
-from bokeh.io import output_notebook, curdoc
-from bokeh.models import HoverTool
-from bokeh.palettes import Category10
+from .utils import (
+    create_dataframe_from_nested_dict,
+    flatten_dict,
+    load_experiment,
+    read_file,
+    ID_TIME_FORMAT,
+)
+from .serializers import detect_serializer
+from .shards import shard_paths, merge_records
+from .index import ExperimentIndex
+from .storage import get_storage, SeriesView, SERIES_DTYPE
+from .aggregators import Quantiles, load_aggregates
+from .sketches import TDigest
+from .lod import LODSeries
+from .cache import SeriesCache
+from .query import experiment_filter
 
-output_notebook(hide_banner=True)
-curdoc().theme = "carbon"
-colors = Category10[10]
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
 
 
-from .utils import create_dataframe_from_nested_dict
+def experiment_paths(log_path):
+    assert os.path.isdir(log_path), f"Invalid log path: {log_path}"
+    paths = []
+    with os.scandir(log_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                paths.append(os.path.join(log_path, entry.name))
+    return sorted(paths)
 
-pd.set_option("display.float_format", lambda x: "%.3e" % x)
+
+def open_series(storage, values_path, key, cache=None):
+    if cache is None or not storage.cacheable:
+        return storage.open(values_path, key)
+    files = storage.files(values_path, key)
+    if not files:
+        return None
+    records = cache.get(files, lambda: storage.open(values_path, key).records())
+    return SeriesView([records])
+
+
+def open_value(experiment_path, key, cache=None):
+    serializer = detect_serializer(experiment_path)
+    if serializer is None:
+        return None
+    meta = read_file(
+        os.path.join(experiment_path, f"meta{serializer.extension}"), serializer
+    )
+
+    storage = get_storage(meta.get("storage", "csv"))
+    views = [
+        open_series(storage, os.path.join(path, "values"), key, cache)
+        for path in [experiment_path] + shard_paths(experiment_path)
+    ]
+    views = [view for view in views if view is not None]
+    if not views:
+        return None
+    if len(views) > 1:
+        # Shards interleave steps, merge them into a single ordered series
+        views = [SeriesView([merge_records([view.records() for view in views])])]
+    return meta["experiment_id"], views[0]
+
+
+def open_digest(experiment_path, key):
+    serializer = detect_serializer(experiment_path)
+    if serializer is None:
+        return None
+    aggregates = load_aggregates(
+        [experiment_path] + shard_paths(experiment_path), serializer
+    )
+    for aggregator in aggregates.get(key, []):
+        if isinstance(aggregator, Quantiles):
+            return aggregator.digest
+    return None
+
+
+def plot_data(experiment_id, steps, values):
+    return {"step": steps, "value": values, "var": [experiment_id] * len(steps)}
+
+
+DF_VALUE_LAYOUTS = ["wide", "long", "aligned"]
+
+
+def long_frame(experiments):
+    """
+    Stacks the records of each experiment id into experiment, step and value
+    columns, filled into arrays allocated once for all experiments.
+    """
+    lengths = [len(records) for records in experiments.values()]
+    codes = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+    steps = np.empty(sum(lengths), dtype=SERIES_DTYPE["step"])
+    values = np.empty(
+        sum(lengths),
+        dtype=(
+            object
+            if any(records.dtype.hasobject for records in experiments.values())
+            else SERIES_DTYPE["value"]
+        ),
+    )
+    offset = 0
+    for records in experiments.values():
+        steps[offset : offset + len(records)] = records["step"]
+        values[offset : offset + len(records)] = records["value"]
+        offset += len(records)
+    return pd.DataFrame(
+        {
+            "experiment": pd.Categorical.from_codes(codes, list(experiments)),
+            "step": steps,
+            "value": values,
+        }
+    )
+
+
+def aligned_frame(experiments, steps=None, num_steps=1000):
+    """
+    Linearly interpolates the records of each experiment id onto one step
+    grid, by default evenly spaced over the steps of all experiments.
+    """
+    if steps is None:
+        bounds = [
+            (records["step"][0], records["step"][-1])
+            for records in experiments.values()
+            if len(records)
+        ]
+        if bounds:
+            lo, hi = min(b[0] for b in bounds), max(b[1] for b in bounds)
+            steps = np.unique(np.linspace(lo, hi, num_steps).round())
+        else:
+            steps = []
+    steps = np.asarray(steps, dtype=float)
+    aligned = np.full((len(steps), len(experiments)), np.nan)
+    for i, records in enumerate(experiments.values()):
+        present = ~np.isnan(records["value"])
+        if present.any():
+            aligned[:, i] = np.interp(
+                steps,
+                records["step"][present],
+                records["value"][present],
+                left=np.nan,
+                right=np.nan,
+            )
+    index = pd.Index(steps, name="step")
+    if len(steps) and np.array_equal(steps, steps.round()):
+        index = index.astype(SERIES_DTYPE["step"])
+    return pd.DataFrame(aligned, index=index, columns=list(experiments))
+
+
+AGGREGATE_STATS = ["count", "mean", "std", "sem", "ci95", "min", "max"]
+
+
+def group_label(experiment, group_by):
+    """
+    Returns the values an experiment has for the params, or else meta entries,
+    it is grouped by, None for missing ones.
+    """
+    params = flatten_dict(experiment.get("params") or {})
+    meta = experiment.get("meta") or {}
+    return tuple(params.get(name, meta.get(name)) for name in group_by)
+
+
+def merge_moments(groups, steps, count, mean, m2, minimum, maximum):
+    """
+    Merges partial moments, the count, mean, sum of squared deviations from
+    the mean, minimum and maximum, into one per group and step. Single values
+    are partial moments with a count of 1, so raw records and earlier merged
+    chunks are merged the same way.
+    """
+    if not len(groups):
+        return groups, steps, count, mean, m2, minimum, maximum
+    order = np.lexsort((steps, groups))
+    groups, steps, count, mean, m2, minimum, maximum = (
+        array[order] for array in (groups, steps, count, mean, m2, minimum, maximum)
+    )
+    new = np.r_[True, (groups[1:] != groups[:-1]) | (steps[1:] != steps[:-1])]
+    starts = np.flatnonzero(new)
+    total = np.add.reduceat(count, starts)
+    merged_mean = np.add.reduceat(count * mean, starts) / total
+    deviation = mean - merged_mean[np.cumsum(new) - 1]
+    return (
+        groups[starts],
+        steps[starts],
+        total,
+        merged_mean,
+        np.add.reduceat(m2 + count * deviation**2, starts),
+        np.minimum.reduceat(minimum, starts),
+        np.maximum.reduceat(maximum, starts),
+    )
+
+
+def value_frame(experiments, layout="wide", steps=None, num_steps=1000):
+    """
+    Builds one of the df_value layouts from the records of each experiment id.
+    """
+    assert layout in DF_VALUE_LAYOUTS, f"Invalid layout: {layout}"
+    if layout == "long":
+        return long_frame(experiments)
+    if layout == "aligned":
+        return aligned_frame(experiments, steps, num_steps)
+    if not experiments:
+        return pd.DataFrame(index=pd.Index([], name="step"))
+    return pd.concat(
+        [
+            SeriesView.to_frame(records, experiment_id)
+            for experiment_id, records in experiments.items()
+        ],
+        axis=1,
+    )
+
+
+class ValueTail:
+    """
+    Follows a value across the experiments of a log path. Every poll only
+    parses what was appended to each series file since the previous one, so
+    its cost grows with the new data rather than the whole history.
+    """
+
+    def __init__(self, log_path, key, list_paths=None):
+        self.log_path = log_path
+        self.key = key
+        self.list_paths = list_paths or partial(experiment_paths, log_path)
+        self._experiments = {}
+        self._cursors = {}
+
+    def poll(self):
+        """
+        Returns the records appended since the last poll per experiment id,
+        the whole series on the first poll.
+        """
+        deltas = {}
+        for experiment_path in self.list_paths():
+            if experiment_path not in self._experiments:
+                serializer = detect_serializer(experiment_path)
+                if serializer is None:
+                    continue
+                meta = read_file(
+                    os.path.join(experiment_path, f"meta{serializer.extension}"),
+                    serializer,
+                )
+                self._experiments[experiment_path] = (
+                    meta["experiment_id"],
+                    get_storage(meta.get("storage", "csv")),
+                )
+            experiment_id, storage = self._experiments[experiment_path]
+
+            records = []
+            for path in [experiment_path] + shard_paths(experiment_path):
+                values_path = os.path.join(path, "values")
+                delta, self._cursors[values_path] = storage.tail(
+                    values_path, self.key, self._cursors.get(values_path)
+                )
+                if len(delta):
+                    records.append(delta)
+            if len(records) > 1:
+                deltas[experiment_id] = merge_records(records)
+            elif records:
+                deltas[experiment_id] = np.array(records[0])
+        return deltas
+
+
+_notebook_ready = False
+
+
+def setup_notebook():
+    # Load bokeh into the notebook on the first plot rather than at import
+    global _notebook_ready
+    if _notebook_ready:
+        return
+    from bokeh.io import output_notebook, curdoc
+
+    output_notebook(hide_banner=True)
+    curdoc().theme = "carbon"
+    _notebook_ready = True
 
 
 class Dashboard:
     def __init__(
         self,
         log_path: str = "./.logs/",
+        max_workers: int = None,
+        executor: str = "thread",
+        use_index: bool = True,
+        cache_size: int = 256 << 20,
+        cache_path: str = None,
     ):
+        """
+        Args:
+            log_path (str, optional): Directory experiments are logged to.
+            max_workers (int, optional): Number of workers scanning experiments
+                in parallel. Defaults to the executor's default, 1 scans
+                sequentially.
+            executor (str, optional): "thread" or "process" pool for scanning.
+            use_index (bool, optional): Keep parsed experiments in a persistent
+                index inside log_path so refreshes only reparse the experiments
+                that changed.
+            cache_size (int, optional): Memory budget in bytes for parsed
+                series kept between calls, 0 disables the cache.
+            cache_path (str, optional): Directory to also keep parsed series
+                in, so they are not reparsed after a restart.
+        """
         assert os.path.isdir(log_path), f"Invalid log path: {log_path}"
+        assert executor in EXECUTORS, f"Invalid executor: {executor}"
         self.log_path = log_path
+        self.max_workers = max_workers
+        self.executor = executor
+        self.use_index = use_index
+        self.cache = (
+            SeriesCache(max_bytes=cache_size, disk_path=cache_path)
+            if cache_size or cache_path
+            else None
+        )
+        self._lod = {}
+        self._filters = []
+        pd.set_option("display.float_format", lambda x: "%.3e" % x)
+
+    def select(self, name=None, params=None, since=None, until=None, tags=None):
+        """
+        Returns a Dashboard over only the experiments matching every given
+        condition. Conditions are checked against the parsed meta and params,
+        from the index when enabled, so no series file of an experiment left
+        out is ever opened. Selections can be chained and are reevaluated on
+        every call, so new matching experiments show up too.
+
+        Args:
+            name (str or list, optional): Experiment name, or list of names,
+                that may contain wildcards such as ``"resnet-*"``.
+            params (dict, optional): Conditions on the params as named in df,
+                e.g. ``{"lr": (">", 1e-3), "seed": 0}``. A tuple holds an
+                operator ("==", "!=", "<", "<=", ">", ">=", "in", "not in")
+                and its operand, any other value has to be equal.
+            since (datetime, date or str, optional): Earliest start time.
+            until (datetime, date or str, optional): Start time to stop before.
+            tags (list, optional): Tags, given to start_experiment, that all
+                have to be present.
+        """
+        dashboard = copy.copy(self)
+        dashboard._filters = self._filters + [
+            experiment_filter(name, params, since, until, tags)
+        ]
+        return dashboard
+
+    def _experiments(self):
+        paths = experiment_paths(self.log_path)
+        if self.use_index:
+            experiments = ExperimentIndex(self.log_path).load(paths, self._map)
+        else:
+            experiments = self._map(load_experiment, paths)
+        return {
+            path: experiment
+            for path, experiment in zip(paths, experiments)
+            if experiment is not None
+            and all(matches(experiment) for matches in self._filters)
+        }
+
+    def _experiment_paths(self):
+        if not self._filters:
+            return experiment_paths(self.log_path)
+        return list(self._experiments())
+
+    def _map(self, fn, experiment_paths):
+        # Results come back in the order of experiment_paths whatever the pool
+        if self.max_workers == 1 or len(experiment_paths) <= 1:
+            return list(map(fn, experiment_paths))
+        with EXECUTORS[self.executor](max_workers=self.max_workers) as executor:
+            return list(executor.map(fn, experiment_paths, chunksize=16))
 
     def df(self):
-        assert os.path.isdir(self.log_path), f"Invalid log path: {self.log_path}"
-        experiments = {}
-        for experiment_path in os.listdir(self.log_path):
-            experiment_path = os.path.join(self.log_path, experiment_path)
-            if not os.path.isdir(experiment_path):
-                continue
+        """
+        Returns the meta, params and values of every experiment as a frame with
+        inferred dtypes: nullable integers and booleans, categoricals for
+        repeated strings and the start time parsed from the experiment id.
+        The inferred dtypes are kept in the index until an experiment changes.
+        """
+        experiments = self._experiments()
+        schema = None
+        if self.use_index:
+            index = ExperimentIndex(self.log_path)
+            digest = index.digest(list(experiments))
+            schema = index.load_schema(digest)
+        inferred = schema is None
+        schema = {} if inferred else schema
+        df = create_dataframe_from_nested_dict(experiments, schema=schema)
+        if self.use_index and inferred:
+            index.save_schema(digest, schema)
 
-            file = os.path.join(experiment_path, "meta.yaml")
-            if not os.path.isfile(file):
-                continue
-            with open(file, "r") as f:
-                experiments[experiment_path] = {"meta": yaml.safe_load(f)}
+        if ("meta", "experiment_id") in df.columns:
+            ids = df[("meta", "experiment_id")].astype(str)
+            df.insert(
+                df.columns.get_loc(("meta", "experiment_id")) + 1,
+                ("meta", "start_time"),
+                pd.to_datetime(ids.str[:13], format=ID_TIME_FORMAT, errors="coerce"),
+            )
+        return df
 
-            for file_name in ["params", "values"]:
-                file = os.path.join(experiment_path, f"{file_name}.yaml")
-                if not os.path.isfile(file):
-                    continue
-                with open(file, "r") as f:
-                    experiments[experiment_path][file_name] = yaml.safe_load(f)
+    def series(self, key):
+        """
+        Returns a lazy SeriesView of a value per experiment id. Series logged
+        with the npy storage are memory-mapped rather than read.
+        """
+        experiments = self._map(
+            partial(open_value, key=key, cache=self.cache), self._experiment_paths()
+        )
+        return dict(experiment for experiment in experiments if experiment is not None)
 
-        experiments = create_dataframe_from_nested_dict(experiments)
+    def df_value(
+        self,
+        key,
+        start=None,
+        stop=None,
+        last=None,
+        layout="wide",
+        steps=None,
+        num_steps=1000,
+    ):
+        """
+        Args:
+            key (str): The value to load.
+            start (int, optional): First step to include.
+            stop (int, optional): Step to stop before.
+            last (int, optional): Only keep each experiment's last points.
+            layout (str, optional): "wide" outer joins the experiments on step
+                with one column each. "long" returns experiment, step and
+                value columns without padding. "aligned" interpolates every
+                experiment onto a common step grid, steps outside an
+                experiment's range are left missing.
+            steps (array, optional): The step grid of the aligned layout.
+            num_steps (int, optional): Number of evenly spaced steps spanning
+                all experiments when no aligned step grid is given.
+        """
+        experiments = {}
+        for experiment_id, view in self.series(key).items():
+            if last is not None:
+                records = view.tail(last)
+            elif start is not None or stop is not None:
+                records = view.range(start, stop)
+            else:
+                records = view.records()
+            experiments[experiment_id] = records
+        return value_frame(experiments, layout, steps, num_steps)
 
-        def is_string_dtype(col):
-            return col.dtype == "object" or pd.api.types.is_string_dtype(col.dtype)
+    def iter_values(
+        self,
+        key,
+        chunk_steps=None,
+        experiments=None,
+        start=None,
+        stop=None,
+        layout="wide",
+        steps=None,
+        num_steps=1000,
+    ):
+        """
+        Yields a value in blocks covering a window of steps of a batch of
+        experiments, in any of the df_value layouts. Only one batch of
+        experiments is open at a time and npy series only read the pages of
+        the current window, so memory is bounded by the block size rather
+        than the sweep.
 
-        styles = [
-            dict(selector=f"th.col_heading.level{i}", props=[("text-align", "left")])
-            for i in range(2)
-        ]
-        styles += [
-            {
-                "selector": f"td:nth-child({experiments.columns.get_loc(col) + 1})",
-                "props": [("text-align", "left")],
+        Args:
+            key (str): The value to load.
+            chunk_steps (int, optional): Steps per block. Defaults to all steps
+                of each batch in one block.
+            experiments (int, optional): Experiments per batch. Defaults to all
+                experiments in one batch.
+            start (int, optional): First step to include.
+            stop (int, optional): Step to stop before.
+            layout (str, optional): "wide", "long" or "aligned", see df_value.
+            steps (array, optional): The step grid of the aligned layout, each
+                block holds the grid steps within its window.
+            num_steps (int, optional): Number of evenly spaced steps per block
+                when no aligned step grid is given.
+        """
+        assert layout in DF_VALUE_LAYOUTS, f"Invalid layout: {layout}"
+        grid = None if steps is None else np.asarray(steps)
+        blocks = self._iter_records(
+            key,
+            self._experiment_paths(),
+            chunk_steps,
+            experiments,
+            start,
+            stop,
+            pad=layout == "aligned",
+        )
+        for (lo, hi), block in blocks:
+            block = dict(block.values())
+            if layout == "aligned" and grid is not None:
+                window = grid[(grid >= lo) & (grid < hi)]
+            elif layout == "aligned":
+                window = np.unique(np.linspace(lo, hi - 1, num_steps).round())
+            else:
+                window = None
+            yield value_frame(block, layout, window, num_steps)
+
+    def _iter_records(
+        self,
+        key,
+        paths,
+        chunk_steps=None,
+        experiments=None,
+        start=None,
+        stop=None,
+        pad=False,
+    ):
+        # Yields the step window and the experiment id and records per path of
+        # every block. Padded blocks also hold the closest record on either
+        # side of the window, so values can be interpolated up to its edges.
+        batch_size = experiments or max(len(paths), 1)
+        for i in range(0, len(paths), batch_size):
+            batch = paths[i : i + batch_size]
+            opened = self._map(partial(open_value, key=key, cache=self.cache), batch)
+            views = {
+                path: value
+                for path, value in zip(batch, opened)
+                if value is not None and len(value[1])
             }
-            for col in experiments.columns
-            if is_string_dtype(experiments[col])
-        ]
-        experiments = experiments.style.set_table_styles(styles)
-        return experiments.data
-
-    def df_value(self, key):
-        assert os.path.isdir(self.log_path), f"Invalid log path: {self.log_path}"
-        experiments = []
-        for experiment_path in os.listdir(self.log_path):
-            experiment_path = os.path.join(self.log_path, experiment_path)
-            if not os.path.isdir(experiment_path):
+            if not views:
                 continue
+            lo = start
+            if lo is None:
+                lo = min(int(view.segments[0]["step"][0]) for _, view in views.values())
+            hi = stop
+            if hi is None:
+                hi = max(int(view.tail(1)["step"][0]) for _, view in views.values()) + 1
+            for window in range(lo, hi, chunk_steps or max(hi - lo, 1)):
+                window_stop = min(window + (chunk_steps or hi - lo), hi)
+                block = {}
+                for path, (experiment_id, view) in views.items():
+                    if pad:
+                        records = view.slice(
+                            max(view.search(window) - 1, 0),
+                            view.search(window_stop) + 1,
+                        )
+                    else:
+                        records = view.range(window, window_stop)
+                    block[path] = (experiment_id, records)
+                yield (window, window_stop), block
 
-            file = os.path.join(experiment_path, "meta.yaml")
-            if not os.path.isfile(file):
-                continue
-            with open(file, "r") as f:
-                experiment_id = yaml.safe_load(f)["experiment_id"]
+    def aggregate_value(
+        self,
+        key,
+        group_by=None,
+        stats=("mean", "std", "count"),
+        steps=None,
+        chunk=None,
+        chunk_steps=None,
+    ):
+        """
+        Computes per step statistics of a value over groups of experiments,
+        e.g. the seeds of every configuration of a sweep, without building
+        the wide frame of all experiments.
 
-            file = os.path.join(experiment_path, "values", f"{key}.csv")
-            if not os.path.isfile(file):
-                continue
-            with open(file, "r") as f:
-                df = pd.read_csv(f, index_col=0)
-                df.rename(columns={df.columns[0]: experiment_id}, inplace=True)
-                experiments += [df]
-        experiments = pd.concat(experiments, axis=1)
-        return experiments
-
-    def plot_value(self, key, log_scale=False):
-        df = (
-            self.df_value(key)
-            .reset_index()
-            .melt("step", value_name="value", var_name="var")
+        Args:
+            key (str): The value to aggregate.
+            group_by (str or list, optional): Params, as named in df, or meta
+                entries whose experiments are aggregated together. Defaults
+                to aggregating all experiments.
+            stats (list, optional): Any of "count", "mean", "std", "sem",
+                "ci95" (the half-width of a normal 95% confidence interval of
+                the mean), "min" and "max".
+            steps (array, optional): Step grid every experiment is linearly
+                interpolated onto first, for experiments logged at different
+                steps. By default only values at the same step are combined.
+            chunk (int, optional): Number of experiments loaded at a time.
+                Only the running statistics are kept between chunks, so
+                memory is bounded by the chunk rather than the sweep.
+            chunk_steps (int, optional): Steps of each chunk of experiments
+                processed at a time, see iter_values.
+
+        Returns:
+            pandas.DataFrame: The statistics indexed by group and step.
+        """
+        assert all(stat in AGGREGATE_STATS for stat in stats), f"Invalid stats: {stats}"
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+        grid = None if steps is None else np.asarray(steps)
+
+        experiments = self._experiments()
+        labels = {}
+        codes = [
+            labels.setdefault(group_label(experiment, group_by), len(labels))
+            for experiment in experiments.values()
+        ]
+        codes = dict(zip(experiments, codes))
+        empty = [np.empty(0, dtype=np.int64)] * 2 + [np.empty(0)] * 5
+        # Moments per step window, blocks only ever merge into their own window
+        windows = {}
+        blocks = self._iter_records(
+            key, list(experiments), chunk_steps, chunk, pad=grid is not None
         )
-        p = figure(
-            x_axis_label="Step",
-            y_axis_label=key,
-            y_axis_type="log" if log_scale else "linear",
+        for (lo, hi), block in blocks:
+            parts = [windows.get(lo, empty)]
+            for path, (_, records) in block.items():
+                present = ~np.isnan(records["value"])
+                step, value = records["step"][present], records["value"][present]
+                if not len(step):
+                    # E.g. a diverged run's stretch of NaNs, nothing to add
+                    continue
+                if grid is not None:
+                    window = grid[(grid >= lo) & (grid < hi)]
+                    value = np.interp(window, step, value, left=np.nan, right=np.nan)
+                    present = ~np.isnan(value)
+                    step, value = window[present], value[present]
+                parts.append(
+                    [
+                        np.full(len(step), codes[path], dtype=np.int64),
+                        step.astype(np.int64),
+                        np.ones(len(step)),
+                        value,
+                        np.zeros(len(step)),
+                        value,
+                        value,
+                    ]
+                )
+            windows[lo] = merge_moments(*map(np.concatenate, zip(*parts)))
+
+        moments = merge_moments(
+            *map(np.concatenate, zip(empty, *windows.values()))
         )
-        for i, (legend_label, d) in enumerate(df.groupby("var")):
-            d["color"] = colors[i % 10]
+        groups, step, count, mean, m2, minimum, maximum = moments
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(m2 / (count - 1))
+        columns = {
+            "count": count.astype(np.int64),
+            "mean": mean,
+            "std": std,
+            "sem": std / np.sqrt(count),
+            "ci95": 1.96 * std / np.sqrt(count),
+            "min": minimum,
+            "max": maximum,
+        }
+        if group_by:
+            group_labels = list(labels)
+            arrays = [
+                [group_labels[code][j] for code in groups] for j in range(len(group_by))
+            ]
+            index = pd.MultiIndex.from_arrays(
+                arrays + [step], names=group_by + ["step"]
+            )
+        else:
+            index = pd.Index(step, name="step")
+        return pd.DataFrame({stat: columns[stat] for stat in stats}, index=index)
+
+    def quantiles(self, key, group_by=None, quantiles=(0.5, 0.95, 0.99)):
+        """
+        Merges the quantile sketches of a value across experiments, e.g. the
+        seeds of a configuration, without reading any series.
+
+        Args:
+            key (str): The value to summarize.
+            group_by (str, optional): Param, or meta entry such as
+                "experiment_name", whose experiments are merged together.
+                Defaults to merging every experiment.
+            quantiles (tuple, optional): Quantiles to estimate.
+
+        Returns:
+            pandas.DataFrame: One row per group with the estimated quantiles,
+                the number of values and the number of experiments merged.
+        """
+        experiment_paths = self._experiment_paths()
+        digests = self._map(partial(open_digest, key=key), experiment_paths)
+        if group_by is None:
+            labels = [key] * len(experiment_paths)
+        else:
+            experiments = self.df()
+            column = next(
+                (
+                    (level, group_by)
+                    for level in ["params", "meta"]
+                    if (level, group_by) in experiments.columns
+                ),
+                None,
+            )
+            assert column is not None, f"Invalid group_by: {group_by}"
+            labels = experiments[column].reindex(experiment_paths).tolist()
+
+        groups = {}
+        for label, digest in zip(labels, digests):
+            if digest is not None:
+                groups.setdefault(None if pd.isna(label) else label, []).append(digest)
+        rows = {}
+        for label, group in groups.items():
+            digest = TDigest.merged(group)
+            estimates = digest.quantile(list(quantiles))
+            rows[label] = {
+                **{f"p{100 * q:g}": v for q, v in zip(quantiles, estimates)},
+                "count": digest.count,
+                "experiments": len(group),
+            }
+        df = pd.DataFrame.from_dict(rows, orient="index")
+        df.index.name = group_by
+        return df
+
+    def lod(self, key):
+        """
+        Returns the multi-resolution summary of a value per experiment id.
+        Summaries are built on first use and reused until the series grows.
+        """
+        lods = {}
+        for experiment_id, view in self.series(key).items():
+            signature = (len(view), view.tail(1)["step"].tolist())
+            cached = self._lod.get((experiment_id, key))
+            if cached is None or cached[0] != signature:
+                cached = (signature, LODSeries(view))
+                self._lod[(experiment_id, key)] = cached
+            lods[experiment_id] = cached[1]
+        return lods
+
+    def plot_value(
+        self,
+        key,
+        log_scale=False,
+        start=None,
+        stop=None,
+        max_points=2000,
+        method="minmax",
+        interactive=False,
+    ):
+        """
+        Args:
+            key (str): The value to plot.
+            log_scale (bool, optional): Use a logarithmic y axis.
+            start (int, optional): First step to plot.
+            stop (int, optional): Step to stop before.
+            max_points (int, optional): Points drawn per experiment, series
+                with more points are downsampled.
+            method (str, optional): Downsampling method, "minmax", "mean" or
+                "lttb".
+            interactive (bool, optional): Serve the plot as a Bokeh app that
+                redraws the visible range at full detail after every zoom or
+                pan.
+        """
+        from bokeh.plotting import show
+
+        setup_notebook()
+        lods = self.lod(key)
+        if not interactive:
+            show(self._plot(key, lods, log_scale, start, stop, max_points, method)[0])
+            return
+
+        def document(doc):
+            from bokeh.events import RangesUpdate
+
+            p, sources = self._plot(
+                key, lods, log_scale, start, stop, max_points, method
+            )
+
+            def refine(event):
+                for experiment_id, source in sources.items():
+                    steps, values = lods[experiment_id].query(
+                        int(np.floor(event.x0)),
+                        int(np.ceil(event.x1)) + 1,
+                        max_points,
+                        method,
+                    )
+                    source.data = plot_data(experiment_id, steps, values)
+
+            p.on_event(RangesUpdate, refine)
+            doc.add_root(p)
+
+        show(document)
+
+    def _plot(self, key, lods, log_scale, start, stop, max_points, method):
+        from bokeh.models import ColumnDataSource
+        from bokeh.palettes import Category10
+
+        colors = Category10[10]
+        p = self._figure(key, log_scale)
+        sources = {}
+        for i, (legend_label, lod) in enumerate(lods.items()):
+            steps, values = lod.query(start, stop, max_points, method)
+            sources[legend_label] = ColumnDataSource(
+                plot_data(legend_label, steps, values)
+            )
+            last = lod.view.tail(1)
             p.line(
                 "step",
                 "value",
-                source=d,
+                source=sources[legend_label],
                 legend_label=legend_label,
                 line_width=2,
                 color=colors[i % 10],
@@ -115,12 +787,87 @@ class Dashboard:
             p.scatter(
                 "step",
                 "value",
-                source=d.iloc[-1:],
+                source=plot_data(legend_label, last["step"], last["value"]),
                 size=8,
                 color=colors[i % 10],
                 legend_label=legend_label,
                 alpha=0.5,
             )
+        self._style(p, key)
+        return p, sources
+
+    def tail(self, key):
+        """
+        Returns a ValueTail that reads only the rows of a value appended since
+        its previous poll.
+        """
+        return ValueTail(self.log_path, key, self._experiment_paths)
+
+    def plot_live(self, key, interval=1.0, rollover=None, log_scale=False):
+        """
+        Serves a Bokeh app plotting a value of running experiments that
+        streams the newly appended rows into the plot every interval.
+
+        Args:
+            key (str): The value to plot.
+            interval (float, optional): Seconds between polls.
+            rollover (int, optional): Points kept per experiment, older
+                points are dropped from the plot.
+            log_scale (bool, optional): Use a logarithmic y axis.
+        """
+        from bokeh.plotting import show
+
+        setup_notebook()
+
+        def document(doc):
+            from bokeh.models import ColumnDataSource
+            from bokeh.palettes import Category10
+
+            colors = Category10[10]
+            tail = self.tail(key)
+            p = self._figure(key, log_scale)
+            sources = {}
+
+            def update():
+                for experiment_id, records in tail.poll().items():
+                    if rollover is not None:
+                        records = records[-rollover:]
+                    steps, values = records["step"], records["value"]
+                    data = plot_data(experiment_id, steps, values)
+                    if experiment_id in sources:
+                        sources[experiment_id].stream(data, rollover)
+                        continue
+                    sources[experiment_id] = ColumnDataSource(data)
+                    p.line(
+                        "step",
+                        "value",
+                        source=sources[experiment_id],
+                        legend_label=experiment_id,
+                        line_width=2,
+                        color=colors[(len(sources) - 1) % 10],
+                    )
+
+            update()
+            self._style(p, key)
+            doc.add_periodic_callback(update, int(interval * 1000))
+            doc.add_root(p)
+
+        show(document)
+
+    @staticmethod
+    def _figure(key, log_scale):
+        from bokeh.plotting import figure
+
+        return figure(
+            x_axis_label="Step",
+            y_axis_label=key,
+            y_axis_type="log" if log_scale else "linear",
+        )
+
+    @staticmethod
+    def _style(p, key):
+        from bokeh.models import HoverTool
+
         p.add_tools(
             HoverTool(
                 tooltips=[
@@ -146,7 +893,6 @@ class Dashboard:
         p.yaxis.axis_label_text_font_size = "20pt"
         p.yaxis.major_label_text_font_size = "16pt"
         p.xaxis.major_label_text_font_size = "16pt"
-        show(p)
 
     def __repr__(self):
         return f"Dashboard(log_path={self.log_path})"
@@ -0,0 +1,210 @@
+from typing import Callable, Optional
+import hashlib
+import json
+import os
+import sqlite3
+
+from .utils import load_experiment
+from .shards import shard_paths
+
+
+INDEX_FILE = "index.sqlite"
+INDEXED_FILES = {"meta", "params", "values", "events", "summary", "aggregates"}
+JSON_TYPES = (str, int, float, bool, type(None))
+
+
+def is_json(data) -> bool:
+    """
+    Whether data consists of JSON types only, so it reads back from JSON
+    unchanged. YAML also parses e.g. dates, which JSON would turn into
+    strings.
+    """
+    if isinstance(data, dict):
+        return all(
+            isinstance(key, str) and is_json(value) for key, value in data.items()
+        )
+    if isinstance(data, list):
+        return all(is_json(value) for value in data)
+    return isinstance(data, JSON_TYPES)
+
+
+def file_signature(experiment_path: str) -> str:
+    """
+    Summarizes the mtime and size of an experiment's indexed files.
+
+    Args:
+        experiment_path (str): The experiment directory.
+
+    Returns:
+        str: A string that changes whenever one of the files changes.
+    """
+    signature = []
+    for path in [experiment_path] + shard_paths(experiment_path):
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.split(".", 1)[0] not in INDEXED_FILES:
+                    continue
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                name = os.path.relpath(entry.path, experiment_path)
+                signature.append([name, stat.st_mtime_ns, stat.st_size])
+    return json.dumps(sorted(signature))
+
+
+class ExperimentIndex:
+    """
+    Persistent SQLite index of the parsed meta, params and values of every
+    experiment under a log path, keyed by experiment directory and
+    invalidated by file mtimes and sizes.
+    """
+
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+        self.index_path = os.path.join(log_path, INDEX_FILE)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.index_path, timeout=60)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS experiments ("
+            "name TEXT PRIMARY KEY, signature TEXT NOT NULL, experiment TEXT)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS schemas ("
+            "signature TEXT PRIMARY KEY, schema TEXT NOT NULL)"
+        )
+        return connection
+
+    def update(self, experiment_path: str, experiment: Optional[dict] = None):
+        """
+        Records an experiment's current state, parsing its files unless the
+        parsed experiment is passed in.
+        """
+        signature = file_signature(experiment_path)
+        if experiment is None:
+            experiment = load_experiment(experiment_path)
+        connection = self._connect()
+        try:
+            with connection:
+                self._upsert(connection, experiment_path, signature, experiment)
+        finally:
+            connection.close()
+
+    def load(
+        self,
+        experiment_paths: list,
+        map_fn: Callable = map,
+    ) -> list:
+        """
+        Returns the parsed experiment for each path, only reparsing the ones
+        whose files changed since they were indexed.
+
+        Args:
+            experiment_paths (list): The experiment directories to load.
+            map_fn (Callable, optional): Maps load_experiment over the stale
+                paths, e.g. to parse them in parallel.
+
+        Returns:
+            list: The parsed experiments in the order of experiment_paths, None
+                for directories that are not experiments.
+        """
+        connection = self._connect()
+        try:
+            indexed = {
+                name: (signature, experiment)
+                for name, signature, experiment in connection.execute(
+                    "SELECT name, signature, experiment FROM experiments"
+                )
+            }
+            signatures = [file_signature(path) for path in experiment_paths]
+            experiments = [None] * len(experiment_paths)
+            stale = []
+            for i, (path, signature) in enumerate(zip(experiment_paths, signatures)):
+                # Experiments that JSON cannot hold are never indexed and
+                # always parsed again
+                name = os.path.basename(os.path.normpath(path))
+                if name in indexed and indexed[name][0] == signature:
+                    experiment = indexed[name][1]
+                    experiments[i] = None if experiment is None else json.loads(experiment)
+                else:
+                    stale.append(i)
+
+            parsed = map_fn(load_experiment, [experiment_paths[i] for i in stale])
+            with connection:
+                for i, experiment in zip(stale, parsed):
+                    experiments[i] = experiment
+                    self._upsert(
+                        connection, experiment_paths[i], signatures[i], experiment
+                    )
+                # Drop experiments that were deleted from the log path
+                names = {
+                    os.path.basename(os.path.normpath(path))
+                    for path in experiment_paths
+                }
+                connection.executemany(
+                    "DELETE FROM experiments WHERE name = ?",
+                    [(name,) for name in indexed if name not in names],
+                )
+        finally:
+            connection.close()
+        return experiments
+
+    def digest(self, experiment_paths: list) -> str:
+        """
+        Returns a digest of the indexed state of the given experiments, which
+        changes whenever one of them is reparsed, added or removed.
+        """
+        connection = self._connect()
+        try:
+            indexed = dict(
+                connection.execute("SELECT name, signature FROM experiments")
+            )
+        finally:
+            connection.close()
+        signatures = sorted(
+            [name, indexed.get(name) or file_signature(path)]
+            for name, path in (
+                (os.path.basename(os.path.normpath(path)), path)
+                for path in experiment_paths
+            )
+        )
+        return hashlib.sha1(json.dumps(signatures).encode()).hexdigest()
+
+    def load_schema(self, digest: str) -> Optional[dict]:
+        """
+        Returns the column dtypes inferred for the experiments with a digest.
+        """
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT schema FROM schemas WHERE signature = ?", (digest,)
+            ).fetchone()
+        finally:
+            connection.close()
+        return None if row is None else json.loads(row[0])
+
+    def save_schema(self, digest: str, schema: dict) -> None:
+        # Only the latest schema is kept, older digests never match again
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM schemas")
+                connection.execute(
+                    "INSERT INTO schemas VALUES (?, ?)", (digest, json.dumps(schema))
+                )
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _upsert(connection, experiment_path, signature, experiment):
+        name = os.path.basename(os.path.normpath(experiment_path))
+        if experiment is not None and not is_json(experiment):
+            connection.execute("DELETE FROM experiments WHERE name = ?", (name,))
+            return
+        connection.execute(
+            "INSERT OR REPLACE INTO experiments VALUES (?, ?, ?)",
+            (name, signature, None if experiment is None else json.dumps(experiment)),
+        )
+
+    def __repr__(self):
+        return f"ExperimentIndex(log_path={self.log_path})"
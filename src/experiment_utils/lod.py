@@ -0,0 +1,221 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .storage import SeriesView
+
+
+LOD_METHODS = ["minmax", "mean", "lttb"]
+
+
+class Level:
+    """
+    One resolution of a series: consecutive buckets with their step span, the
+    minimum and maximum and the steps they were at, and the sum and count of
+    the non-missing values.
+    """
+
+    def __init__(self, start, stop, min_step, min, max_step, max, sum, count):
+        self.start = start
+        self.stop = stop
+        self.min_step = min_step
+        self.min = min
+        self.max_step = max_step
+        self.max = max
+        self.sum = sum
+        self.count = count
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> "Level":
+        steps, values = records["step"], records["value"]
+        missing = np.isnan(values)
+        return cls(
+            steps,
+            steps,
+            steps,
+            values,
+            steps,
+            values,
+            np.where(missing, 0.0, values),
+            (~missing).astype(np.int64),
+        )
+
+    def coarsen(self, size: int) -> "Level":
+        """
+        Merges every ``size`` consecutive buckets into one.
+        """
+        n = len(self)
+        num_buckets = -(-n // size)
+        first = np.arange(num_buckets) * size
+        last = np.minimum(first + size - 1, n - 1)
+        rows = np.arange(num_buckets)
+
+        def blocks(array, fill):
+            padded = np.full(num_buckets * size, fill, dtype=array.dtype)
+            padded[:n] = array
+            return padded.reshape(num_buckets, size)
+
+        count = np.add.reduceat(self.count, first)
+        # Missing values never win, buckets without any values stay missing
+        mins = blocks(np.where(np.isnan(self.min), np.inf, self.min), np.inf)
+        i = np.argmin(mins, axis=1)
+        maxs = blocks(np.where(np.isnan(self.max), -np.inf, self.max), -np.inf)
+        j = np.argmax(maxs, axis=1)
+        return Level(
+            self.start[first],
+            self.stop[last],
+            blocks(self.min_step, 0)[rows, i],
+            np.where(count > 0, mins[rows, i], np.nan),
+            blocks(self.max_step, 0)[rows, j],
+            np.where(count > 0, maxs[rows, j], np.nan),
+            np.add.reduceat(self.sum, first),
+            count,
+        )
+
+    @classmethod
+    def concatenate(cls, levels: list) -> "Level":
+        fields = zip(*(vars(level).values() for level in levels))
+        return cls(*map(np.concatenate, fields))
+
+    def select(self, start: Optional[int], stop: Optional[int]) -> "Level":
+        """
+        Returns the buckets overlapping ``start <= step < stop``.
+        """
+        lo = 0 if start is None else np.searchsorted(self.stop, start, "left")
+        hi = len(self) if stop is None else np.searchsorted(self.start, stop, "left")
+        return Level(*(array[lo:hi] for array in vars(self).values()))
+
+
+class LODSeries:
+    """
+    Multi-resolution summary of one series for plotting. Each level merges
+    ``factor`` buckets of the one below, so any step range can be drawn from
+    the coarsest level that still has enough buckets, and zooming in falls
+    through to finer levels and finally the raw records.
+
+    Args:
+        view (SeriesView): The series to summarize.
+        bucket_size (int, optional): Records per bucket of the finest level.
+        factor (int, optional): Buckets merged per bucket of the next level.
+        chunk_rows (int, optional): Records summarized at a time, which bounds
+            the memory used on top of the levels themselves.
+    """
+
+    def __init__(
+        self,
+        view: SeriesView,
+        bucket_size: int = 16,
+        factor: int = 4,
+        chunk_rows: int = 1 << 20,
+    ):
+        assert bucket_size > 1 and factor > 1, "Invalid level sizes"
+        self.view = view
+        self.levels = []
+        if len(view) > bucket_size:
+            # Whole buckets per chunk so no bucket straddles two chunks
+            chunk_rows = max(chunk_rows // bucket_size, 1) * bucket_size
+            level = Level.concatenate(
+                [
+                    Level.from_records(records).coarsen(bucket_size)
+                    for records in view.chunks(chunk_rows)
+                ]
+            )
+            self.levels.append(level)
+            while len(level) > factor:
+                level = level.coarsen(factor)
+                self.levels.append(level)
+
+    def query(
+        self,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+        max_points: int = 2000,
+        method: str = "minmax",
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns at most about ``max_points`` steps and values representing the
+        records with ``start <= step < stop``.
+
+        Args:
+            method (str, optional): "minmax" keeps the extremes of every bucket
+                so spikes stay visible, "mean" draws bucket averages and
+                "lttb" picks raw points with Largest-Triangle-Three-Buckets.
+        """
+        assert method in LOD_METHODS, f"Invalid method: {method}"
+        # Count the records in range without reading them, zooming in only
+        # costs the raw points once they fit
+        lo = 0 if start is None else self.view.search(start)
+        hi = len(self.view) if stop is None else self.view.search(stop)
+        if hi - lo <= max_points or method == "lttb":
+            records = self.view.slice(lo, hi)
+            if method == "lttb":
+                return lttb(records["step"], records["value"], max_points)
+            return records["step"], records["value"]
+
+        # Every bucket adds two points to a minmax line and one to a mean line
+        per_bucket = 2 if method == "minmax" else 1
+        selected = None
+        for level in self.levels:
+            selected = level.select(start, stop)
+            if len(selected) * per_bucket <= max_points:
+                break
+        if selected is None:
+            records = self.view.slice(lo, hi)
+            return records["step"], records["value"]
+        if method == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means = selected.sum / selected.count
+            return (selected.start + selected.stop) // 2, means
+        return minmax_points(selected)
+
+
+def minmax_points(level: Level) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Interleaves the minimum and maximum of every bucket in step order.
+    """
+    steps = np.empty(2 * len(level), dtype=level.min_step.dtype)
+    values = np.empty(2 * len(level))
+    min_first = level.min_step <= level.max_step
+    steps[0::2] = np.where(min_first, level.min_step, level.max_step)
+    steps[1::2] = np.where(min_first, level.max_step, level.min_step)
+    values[0::2] = np.where(min_first, level.min, level.max)
+    values[1::2] = np.where(min_first, level.max, level.min)
+    return steps, values
+
+
+def lttb(
+    steps: np.ndarray, values: np.ndarray, num_points: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsamples to ``num_points`` points with Largest-Triangle-Three-Buckets,
+    which keeps the points that shape the line the most.
+    """
+    present = ~np.isnan(values)
+    steps, values = steps[present], values[present]
+    n = len(values)
+    if num_points >= n or num_points < 3:
+        return steps, values
+
+    x = steps.astype(float)
+    # The first and last points are kept, the rest is split into buckets
+    edges = np.linspace(1, n - 1, num_points - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    x_means = np.add.reduceat(x[1 : n - 1], edges[:-1] - 1) / sizes
+    y_means = np.add.reduceat(values[1 : n - 1], edges[:-1] - 1) / sizes
+    x_means = np.r_[x_means[1:], x[-1]]
+    y_means = np.r_[y_means[1:], values[-1]]
+
+    selected = np.empty(num_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for b, (lo, hi) in enumerate(zip(edges[:-1], edges[1:])):
+        areas = np.abs(
+            (x[a] - x_means[b]) * (values[lo:hi] - values[a])
+            - (x[a] - x[lo:hi]) * (y_means[b] - values[a])
+        )
+        a = lo + int(np.argmax(areas))
+        selected[b + 1] = a
+    return steps[selected], values[selected]
@@ -1,31 +1,183 @@
-from typing import Any, Optional, Callable
+from typing import Any, Optional, Callable, Sequence
+import atexit
+import functools
+import numbers
 import os
-import yaml
-import csv
+import time
+import warnings
 
-from .utils import generate_id, validate_experiment_name, update_yaml, compare_fns
+import numpy as np
+
+from .utils import (
+    generate_id,
+    validate_experiment_name,
+    read_file,
+    write_file,
+    update_file,
+    fsync_path,
+    summary_key,
+    compare_fns,
+    FSYNC_POLICIES,
+)
+from .serializers import get_serializer, detect_serializer
+from .storage import get_storage
+from .index import ExperimentIndex
+from .writer import AsyncWriter
+from .wal import EventLog, WAL_FILE, replay_events
+from .shards import shard_path
+from .aggregators import Aggregator, Quantiles, AGGREGATES_FILE, load_aggregates
+
+
+def _ignore_nan(reduce: Callable) -> Callable:
+    # compare_fns never let a NaN replace a value, so NaNs are skipped, and a
+    # series of only NaNs reduces to NaN without warning
+    def reducer(values):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return reduce(values)
+
+    return reducer
+
+
+# Vectorized equivalents of compare_fns over a whole series
+SERIES_REDUCERS = {
+    compare_fns.new: lambda values: values[-1],
+    compare_fns.max: _ignore_nan(np.nanmax),
+    compare_fns.min: _ignore_nan(np.nanmin),
+}
+
+# Seconds between writes of changed aggregator states outside explicit flushes
+AGGREGATES_INTERVAL = 10.0
+
+
+def numeric_array(values: Any) -> Optional[np.ndarray]:
+    """
+    Returns values as floats with None as NaN, or None if any value is not
+    a number.
+    """
+    array = np.asarray(values)
+    if array.dtype.kind in "biuf":
+        return array.astype(float)
+    if array.dtype.kind == "O" and all(
+        value is None or isinstance(value, numbers.Number) for value in array.flat
+    ):
+        return np.array(array, dtype=float)
+    return None
 
 
 class Logger:
     def __init__(
         self,
         log_path: str = "./.logs/",
+        buffer_size: int = 0,
+        flush_interval: Optional[float] = None,
+        async_mode: bool = False,
+        max_queue_size: int = 1024,
+        backpressure: str = "block",
+        storage: str = "csv",
+        index: bool = True,
+        serializer: str = "yaml",
+        fsync: str = "flush",
+        wal: bool = False,
+        shard: Optional[str] = None,
+        quantiles: Optional[Sequence[float]] = (0.5, 0.95, 0.99),
     ):
+        """
+        Args:
+            log_path (str, optional): Directory experiments are written to.
+            buffer_size (int, optional): Number of logged values to accumulate in
+                memory before they are written out. 0 writes on every call.
+            flush_interval (float, optional): Maximum number of seconds buffered
+                values are held before being written out.
+            async_mode (bool, optional): Run all file I/O on a background writer
+                thread. Errors raised there surface on the next call.
+            max_queue_size (int, optional): Maximum number of pending calls in
+                async mode.
+            backpressure (str, optional): Policy when the async queue is full:
+                "block", "drop_oldest" or "grow". "drop_oldest" only ever
+                discards logged values, never params or flushes.
+            storage (str, optional): Format new experiments store value series
+                in: "csv", "npy", "parquet" or "log", which appends every
+                series to a single file. Only "csv" holds values other than
+                numbers. Resumed experiments keep the format they were
+                started with.
+            index (bool, optional): Record experiments in the log path's
+                experiment index when they start and end.
+            serializer (str, optional): Format new experiments write their meta,
+                params and values files in: "yaml", "json" or "msgpack".
+                Resumed experiments keep the format they were started with.
+            fsync (str, optional): When written files are forced to stable
+                storage: "always" on every write, "flush" only on explicit
+                flush()/end_experiment(), or "never". Files are always
+                replaced atomically.
+            wal (bool, optional): Append every param and value update of new
+                experiments to an event log instead of rewriting the params
+                and values files, which are then only materialized by
+                compact() and end_experiment().
+            shard (str, optional): Name of this process' shard, e.g. its rank.
+                Sharded loggers write params, values and series only under
+                shards/<shard>/ of the experiment, so any number of processes
+                can log to one experiment without sharing files. Readers merge
+                the shards.
+            quantiles (Sequence[float], optional): Quantiles estimated with a
+                mergeable sketch for every numeric key that has no Quantiles
+                aggregator tracked, shown as e.g. ``p95_<key>``. None disables
+                the sketches.
+        """
+        assert not (wal and shard), "Sharded loggers do not support the event log"
+        assert fsync in FSYNC_POLICIES, f"Invalid fsync policy: {fsync}"
+        assert buffer_size >= 0, f"Invalid buffer size: {buffer_size}"
         self.log_path = log_path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.storage = get_storage(storage).name
+        self.index = index
+        self.serializer = get_serializer(serializer).name
+        self.fsync = fsync
+        self.wal = wal
+        self.shard = shard
+        self.quantiles = None if quantiles is None else list(quantiles)
         self.experiment_path = None
+        self._ended = True
         self.experiment_id = None
         self.experiment_name = None
 
+        self._storage = None
+        self._serializer = None
+        self._event_log = None
+        self._params = {}
+        self._summary_info = {}
+        self._aggregators = {}
+        self._aggregates_dirty = False
+        self._last_aggregates = time.monotonic()
+        self._rows = {}
+        self._values = {}
+        self._values_dirty = False
+        self._params_synced = True
+        self._num_buffered = 0
+        self._last_flush = time.monotonic()
+        self._writer = (
+            AsyncWriter(max_queue_size=max_queue_size, backpressure=backpressure)
+            if async_mode
+            else None
+        )
+        if self._writer is not None:
+            # Drain the queue and write out buffered values at interpreter exit
+            atexit.register(self.close)
+
     def is_experiment(self) -> bool:
         return os.path.isdir(self.experiment_path)
 
     def start_experiment(
         self,
         experiment_name: Optional[str] = None,
+        tags: Optional[Sequence[str]] = None,
     ) -> None:
         assert validate_experiment_name(
             experiment_name
         ), f"Invalid experiment name: {experiment_name}"
+        if self.experiment_path is not None:
+            self.end_experiment()
         self.experiment_name = experiment_name
 
         experiment_id = generate_id()
@@ -39,31 +191,117 @@ class Logger:
         os.makedirs(experiment_path)
         self.experiment_id = experiment_id
         self.experiment_path = experiment_path
+        self._ended = False
+        self._values = {}
+        self._params = {}
+        self._summary_info = {}
+        self._aggregators = {}
+        if not os.path.isdir(self._write_path()):
+            os.makedirs(self._write_path())
+        self._storage = get_storage(self.storage)(
+            os.path.join(self._write_path(), "values")
+        )
+        self._serializer = get_serializer(self.serializer)
+        self._event_log = EventLog(experiment_path) if self.wal else None
 
-        with open(os.path.join(experiment_path, "meta.yaml"), "w") as f:
-            yaml.dump(
-                {
-                    "experiment_id": experiment_id,
-                    "experiment_name": experiment_name,
-                },
-                f,
-            )
+        write_file(
+            os.path.join(experiment_path, f"meta{self._serializer.extension}"),
+            {
+                "experiment_id": experiment_id,
+                "experiment_name": experiment_name,
+                "storage": self.storage,
+                "tags": list(tags or []),
+            },
+            self._serializer,
+            fsync=self.fsync != "never",
+        )
+        if self.index:
+            ExperimentIndex(self.log_path).update(experiment_path)
 
     def resume_experiment(self, experiment_subpath: str) -> None:
+        if self.experiment_path is not None:
+            self.end_experiment()
         self.experiment_path = os.path.join(self.log_path, experiment_subpath)
+        self._ended = False
         assert self.is_experiment()
-        with open(os.path.join(self.experiment_path, "meta.yaml"), "r") as f:
-            meta = yaml.safe_load(f)
+        self._serializer = detect_serializer(self.experiment_path)
+        assert self._serializer is not None, f"Invalid experiment: {experiment_subpath}"
+        meta = read_file(
+            os.path.join(self.experiment_path, f"meta{self._serializer.extension}"),
+            self._serializer,
+        )
         self.experiment_id = meta["experiment_id"]
         self.experiment_name = meta["experiment_name"]
+        if not os.path.isdir(self._write_path()):
+            os.makedirs(self._write_path())
+        self._storage = get_storage(meta.get("storage", "csv"))(
+            os.path.join(self._write_path(), "values")
+        )
+
+        # Keep the summary in memory so logging never rereads the values file
+        file = self._file("summary" if self.shard else "values")
+        summary = {}
+        if os.path.isfile(file):
+            summary = read_file(file, self._serializer) or {}
+        if self.shard:
+            self._values = {k: entry["value"] for k, entry in summary.items()}
+            self._summary_info = {
+                k: (entry["compare_fn"], entry["time"]) for k, entry in summary.items()
+            }
+        else:
+            self._values = summary
+        self._aggregators = load_aggregates([self._write_path()], self._serializer)
+
+        # Experiments logged with an event log keep using it
+        self._event_log = None
+        if os.path.isfile(os.path.join(self.experiment_path, WAL_FILE)):
+            file = self._file("params")
+            params = read_file(file, self._serializer) if os.path.isfile(file) else {}
+            self._params, self._values = replay_events(
+                self.experiment_path, params or {}, self._values
+            )
+            self._event_log = EventLog(self.experiment_path)
+
+    def compact(self) -> None:
+        """
+        Materializes the params and values files from the event log.
+        """
+        self._submit(self._compact)
+        if self._writer is not None:
+            self._writer.flush()
+
+    def end_experiment(self) -> None:
+        self._submit(self._end_experiment)
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """
+        Ends the current experiment and stops the writer thread in async mode.
+        """
+        if self._writer is not None and self._writer.closed:
+            return
+        if self.experiment_path is not None:
+            self.end_experiment()
+        if self._writer is not None:
+            self._writer.close()
+            atexit.unregister(self.close)
+
+    def track(self, key: str, *aggregators: Aggregator):
+        """
+        Maintains streaming aggregators, e.g. ``Mean()`` or ``EMA(0.9)``, over
+        every numeric value logged for a key. Their states are persisted with
+        the experiment on explicit flushes and otherwise at most every
+        AGGREGATES_INTERVAL seconds, and their results show up in the values
+        summary as ``<label>_<key>``. Aggregators restored on resume are kept.
+        """
+        self._submit(self._track, key, aggregators)
 
     def log_param(self, key: str, value: Any):
-        assert self.is_experiment()
-        update_yaml(os.path.join(self.experiment_path, "params.yaml"), {key: value})
+        self._submit(self._log_params, {key: value})
 
     def log_params(self, params: dict):
-        assert self.is_experiment()
-        update_yaml(os.path.join(self.experiment_path, "params.yaml"), params)
+        self._submit(self._log_params, dict(params))
 
     def log_value(
         self,
@@ -72,33 +310,10 @@ class Logger:
         step: Optional[int] = None,
         compare_fn: Callable = compare_fns.new,
     ):
-        assert self.is_experiment()
-        # Update the values csv file
-        if not os.path.isdir(os.path.join(self.experiment_path, "values")):
-            os.makedirs(os.path.join(self.experiment_path, "values"))
-        file = os.path.join(self.experiment_path, "values", f"{key}.csv")
-        if not os.path.isfile(file):
-            with open(file, "w") as f:
-                writer = csv.writer(f)
-                writer.writerow(["step", "value"])
-        with open(file, "a") as f:
-            writer = csv.writer(f)
-            writer.writerow([step, value])
-
-        # Update the value.yaml file
-        file = os.path.join(self.experiment_path, "values.yaml")
-        if os.path.isfile(file):
-            with open(file, "r") as f:
-                values = yaml.safe_load(f)
-        else:
-            values = {}
-        key_ = f"{"last" if compare_fn is compare_fns.new else "best"}_{key}"
-        values[key_] = compare_fn(
-            value,
-            values.get(key, None),
+        self._check_values([value])
+        self._submit(
+            self._log_values, {key: value}, step, compare_fn, droppable=True
         )
-        with open(os.path.join(self.experiment_path, "values.yaml"), "w") as f:
-            yaml.dump(values, f)
 
     def log_values(
         self,
@@ -106,14 +321,289 @@ class Logger:
         step: Optional[int] = None,
         compare_fn: Callable = compare_fns.new,
     ):
+        self._check_values(list(value_map.values()))
+        self._submit(
+            self._log_values, dict(value_map), step, compare_fn, droppable=True
+        )
+
+    def log_series(
+        self,
+        key: str,
+        steps: Any,
+        values: Any,
+        compare_fn: Callable = compare_fns.new,
+    ):
+        """
+        Logs many values of one key at once, e.g. a whole history or a
+        per-sample array, with a single bulk append and summary update.
+
+        Args:
+            key (str): The value to log.
+            steps: The integer step of each value, a NumPy array, pandas
+                Series or sequence. If None, the index of a pandas Series is
+                used, otherwise values are logged without steps.
+            values: A NumPy array, pandas Series or sequence of values.
+            compare_fn (Callable, optional): How the summary is updated.
+        """
+        if steps is None and hasattr(values, "to_numpy") and hasattr(values, "index"):
+            steps = values.index
+        # Copies, in async mode the caller may reuse its buffers right away
+        values = np.array(values)
+        if steps is None:
+            steps = [None] * len(values)
+        else:
+            steps = np.array(steps)
+            # Checked here so invalid steps never leave rows half written
+            assert (
+                not len(steps)
+                or steps.dtype.kind in "iu"
+                or steps.dtype == object
+                and all(s is None or isinstance(s, numbers.Integral) for s in steps)
+            ), f"Invalid steps: {steps.dtype}"
+        assert len(steps) == len(values), "steps and values differ in length"
+        self._check_values(values)
+        self._submit(
+            self._log_series, key, values, steps, compare_fn, droppable=True
+        )
+
+    def flush(self) -> None:
+        """
+        Writes all buffered values to the value series and the values file.
+        In async mode this also waits for the writer thread to catch up.
+        """
+        self._submit(self._flush, True)
+        if self._writer is not None:
+            self._writer.flush()
+
+    def _check_values(self, values: Any) -> None:
+        # Rejected on the caller's thread, before anything is buffered
+        if self._storage is not None and self._storage.numeric_only:
+            assert (
+                numeric_array(values) is not None
+            ), f"The {self._storage.name} storage only holds numbers"
+
+    def _submit(self, fn: Callable, *args, droppable: bool = False) -> None:
+        # Only value records may be shed under the "drop_oldest" policy
+        if self._writer is None:
+            fn(*args)
+        else:
+            self._writer.submit(fn, *args, droppable=droppable)
+
+    def _end_experiment(self) -> None:
+        # Starting, resuming and closing end the experiment, which may
+        # already have been ended explicitly
+        if self._ended:
+            return
+        assert self.is_experiment()
+        self._flush(True)
+        self._storage.close()
+        if self._event_log is not None:
+            self._compact()
+            self._event_log.close()
+            self._event_log = None
+        self._ended = True
+        if self.index:
+            ExperimentIndex(self.log_path).update(self.experiment_path)
+
+    def _compact(self) -> None:
+        assert self.is_experiment()
+        assert self._event_log is not None, "Experiment has no event log"
+        self._flush()
+        fsync = self.fsync != "never"
+        params = {k: self._params[k] for k in sorted(self._params)}
+        write_file(self._file("params"), params, self._serializer, fsync=fsync)
+        write_file(self._file("values"), self._values, self._serializer, fsync=fsync)
+        self._values_dirty = False
+        self._event_log.checkpoint(fsync=fsync)
+
+    def _track(self, key: str, aggregators: tuple) -> None:
+        tracked = self._aggregators.setdefault(key, [])
+        names = {aggregator.name for aggregator in tracked}
+        tracked.extend(
+            aggregator for aggregator in aggregators if aggregator.name not in names
+        )
+
+    def _append_series(self, key: str, steps: Any, values: Any) -> None:
+        # Aggregators only summarize numbers, other batches are just stored
+        numeric = numeric_array(values)
+        tracked = self._aggregators.get(key, [])
+        if numeric is not None:
+            if self.quantiles is not None and not any(
+                isinstance(aggregator, Quantiles) for aggregator in tracked
+            ):
+                # Sketch the distribution of every numeric key by default
+                tracked = self._aggregators.setdefault(key, [])
+                tracked.append(Quantiles(self.quantiles))
+            steps_ = np.asarray(steps, dtype=float)
+            for aggregator in tracked:
+                aggregator.update(numeric, steps_)
+            self._aggregates_dirty = bool(tracked) or self._aggregates_dirty
+        self._storage.append(key, steps, values)
+
+    def _log_params(self, params: dict) -> None:
+        assert self.is_experiment()
+        if self._event_log is not None:
+            self._event_log.log_params(params)
+            self._params.update(params)
+            return
+        update_file(
+            self._file("params"),
+            params,
+            self._serializer,
+            fsync=self.fsync == "always",
+        )
+        self._params_synced = self.fsync != "flush"
+
+    def _log_values(
+        self,
+        value_map: dict,
+        step: Optional[int],
+        compare_fn: Callable,
+    ) -> None:
         assert self.is_experiment()
         for key, value in value_map.items():
-            self.log_value(
-                key=key,
-                value=value,
-                step=step,
-                compare_fn=compare_fn,
+            self._buffer_value(key, value, step, compare_fn)
+        self._maybe_flush()
+
+    def _log_series(
+        self,
+        key: str,
+        values: np.ndarray,
+        steps: Any,
+        compare_fn: Callable,
+    ) -> None:
+        assert self.is_experiment()
+        if not len(values):
+            return
+        step = steps[-1] if steps[-1] is None else int(steps[-1])
+        reducer = SERIES_REDUCERS.get(compare_fn)
+        if reducer is not None:
+            value = reducer(values)
+        else:
+            value = functools.reduce(lambda old, new: compare_fn(new, old), values)
+        if isinstance(value, np.generic):
+            value = value.item()
+
+        # Keep the series in order behind values of this key still buffered
+        if key in self._rows:
+            buffered_steps, buffered_values = self._rows.pop(key)
+            self._append_series(key, buffered_steps, buffered_values)
+            self._num_buffered -= len(buffered_values)
+        self._append_series(key, steps, values)
+        self._update_summary(key, value, step, compare_fn)
+        # The whole series counts as a single buffered write
+        self._num_buffered += 1
+        self._maybe_flush()
+
+    def _flush(self, explicit: bool = False) -> None:
+        assert self.is_experiment()
+        fsync = self.fsync == "always" or (self.fsync == "flush" and explicit)
+        if self._num_buffered == 0 and not fsync:
+            return
+
+        # Append the buffered rows to the value series. Each key is taken out
+        # of the buffer before its rows are written, so a failing append never
+        # writes them twice and the keys after it stay buffered
+        for key in list(self._rows):
+            steps, values = self._rows.pop(key)
+            self._append_series(key, steps, values)
+        self._num_buffered = 0
+        self._storage.flush(fsync=fsync, explicit=explicit)
+
+        # Sketches change with every value, so their states are only written
+        # out on explicit flushes and every AGGREGATES_INTERVAL seconds
+        if self._aggregates_dirty and (
+            explicit
+            or time.monotonic() - self._last_aggregates >= AGGREGATES_INTERVAL
+        ):
+            aggregates = {
+                key: [aggregator.state() for aggregator in aggregators]
+                for key, aggregators in self._aggregators.items()
+            }
+            write_file(
+                self._file(AGGREGATES_FILE), aggregates, self._serializer, fsync=fsync
+            )
+            self._aggregates_dirty = False
+            self._last_aggregates = time.monotonic()
+
+        # Persist the in-memory summary to the values file, or to the event
+        # log which is only materialized when compacting
+        if self._event_log is not None:
+            self._event_log.flush(fsync=fsync)
+        elif self._values_dirty and self.shard:
+            summary = {}
+            for key_, value in self._values.items():
+                compare_fn, logged_at = self._summary_info[key_]
+                summary[key_] = {
+                    "value": value,
+                    "compare_fn": compare_fn,
+                    "time": logged_at,
+                }
+            write_file(self._file("summary"), summary, self._serializer, fsync=fsync)
+            self._values_dirty = False
+        elif self._values_dirty:
+            write_file(
+                self._file("values"), self._values, self._serializer, fsync=fsync
             )
+            self._values_dirty = False
+        if fsync and not self._params_synced:
+            fsync_path(self._file("params"))
+            fsync_path(self._write_path())
+            self._params_synced = True
+
+        self._last_flush = time.monotonic()
+
+    def _write_path(self) -> str:
+        if self.shard is None:
+            return self.experiment_path
+        return shard_path(self.experiment_path, self.shard)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self._write_path(), f"{name}{self._serializer.extension}")
+
+    def _buffer_value(
+        self,
+        key: str,
+        value: Any,
+        step: Optional[int],
+        compare_fn: Callable,
+    ) -> None:
+        steps, values = self._rows.setdefault(key, ([], []))
+        steps.append(step)
+        values.append(value)
+        self._update_summary(key, value, step, compare_fn)
+        self._num_buffered += 1
+
+    def _update_summary(
+        self,
+        key: str,
+        value: Any,
+        step: Optional[int],
+        compare_fn: Callable,
+    ) -> None:
+        if self._event_log is not None:
+            self._event_log.log_value(key, value, step, compare_fn)
+        key_ = summary_key(key, compare_fn)
+        self._values[key_] = compare_fn(
+            value,
+            self._values.get(key_, None),
+        )
+        if self.shard:
+            self._summary_info[key_] = (compare_fn.__name__, time.time())
+        self._values_dirty = True
+
+    def _maybe_flush(self) -> None:
+        if self._num_buffered >= max(self.buffer_size, 1) or (
+            self.flush_interval is not None
+            and time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self._flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def __repr__(self):
         return f"Logger(log_path={self.log_path})"
@@ -0,0 +1,99 @@
+from typing import Callable, Optional, Sequence, Union
+import datetime
+import fnmatch
+import operator
+
+from .utils import experiment_time, flatten_dict
+
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, options: value in options,
+    "not in": lambda value, options: value not in options,
+}
+
+
+def _time(value) -> datetime.datetime:
+    if isinstance(value, str):
+        return datetime.datetime.fromisoformat(value)
+    if isinstance(value, datetime.datetime):
+        return value
+    # A date selects from its midnight on
+    return datetime.datetime.combine(value, datetime.time())
+
+
+def _param_matches(value, condition) -> bool:
+    if isinstance(condition, tuple):
+        op, expected = condition
+        try:
+            return bool(OPERATORS[op](value, expected))
+        except TypeError:
+            # Values of another type, e.g. None, never match a comparison
+            return False
+    return value == condition
+
+
+def experiment_filter(
+    name: Optional[Union[str, Sequence[str]]] = None,
+    params: Optional[dict] = None,
+    since=None,
+    until=None,
+    tags: Optional[Sequence[str]] = None,
+) -> Callable[[dict], bool]:
+    """
+    Builds a predicate over parsed experiments, as returned by
+    load_experiment or the experiment index.
+
+    Args:
+        name (str or list, optional): Experiment name, or list of names, that
+            may contain shell-style wildcards such as ``"resnet-*"``.
+        params (dict, optional): Conditions on params, flattened as in
+            Dashboard.df, e.g. ``{"optimizer_lr": (">", 1e-3), "seed": 0}``.
+            A tuple holds one of OPERATORS and the operand, any other value
+            has to be equal. Experiments missing a param never match.
+        since (datetime, date or str, optional): Earliest start time.
+        until (datetime, date or str, optional): Start time to stop before.
+        tags (list, optional): Tags that all have to be present.
+
+    Returns:
+        Callable: True for the experiments matching every condition.
+    """
+    names = [name] if isinstance(name, str) else name
+    params = params or {}
+    for condition in params.values():
+        if isinstance(condition, tuple):
+            assert condition[0] in OPERATORS, f"Invalid operator: {condition[0]}"
+    since = None if since is None else _time(since)
+    until = None if until is None else _time(until)
+    tags = None if tags is None else set(tags)
+
+    def matches(experiment: dict) -> bool:
+        meta = experiment.get("meta") or {}
+        if names is not None and not any(
+            fnmatch.fnmatchcase(str(meta.get("experiment_name")), pattern)
+            for pattern in names
+        ):
+            return False
+        if tags is not None and not tags.issubset(meta.get("tags") or []):
+            return False
+        if since is not None or until is not None:
+            started = experiment_time(str(meta.get("experiment_id", "")))
+            if started is None:
+                return False
+            if since is not None and started < since:
+                return False
+            if until is not None and started >= until:
+                return False
+        if params:
+            flat = flatten_dict(experiment.get("params") or {})
+            for key, condition in params.items():
+                if key not in flat or not _param_matches(flat[key], condition):
+                    return False
+        return True
+
+    return matches
@@ -0,0 +1,113 @@
+from typing import Any, Optional
+import json
+import os
+
+import yaml
+
+# Prefer the libyaml backed loader and dumper, they are an order of magnitude
+# faster than the pure Python ones
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+
+def _default(obj: Any) -> Any:
+    # NumPy scalars and arrays
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+class Dumper(SafeDumper):
+    pass
+
+
+# Write NumPy values as plain values rather than tags safe loading rejects
+Dumper.add_multi_representer(
+    object, lambda dumper, obj: dumper.represent_data(_default(obj))
+)
+
+
+class YamlSerializer:
+    name = "yaml"
+    extension = ".yaml"
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        return yaml.load(data, Loader=SafeLoader)
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return yaml.dump(obj, Dumper=Dumper, encoding="utf-8")
+
+
+class JsonSerializer:
+    name = "json"
+    extension = ".json"
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        try:
+            import orjson
+        except ImportError:
+            return json.loads(data)
+        return orjson.loads(data)
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        try:
+            import orjson
+        except ImportError:
+            return json.dumps(obj, sort_keys=True, default=_default).encode("utf-8")
+        return orjson.dumps(
+            obj,
+            default=_default,
+            option=orjson.OPT_SORT_KEYS
+            | orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+class MsgpackSerializer:
+    name = "msgpack"
+    extension = ".msgpack"
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        import msgpack
+
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        import msgpack
+
+        return msgpack.packb(obj, default=_default)
+
+
+SERIALIZERS = {
+    serializer.name: serializer
+    for serializer in [YamlSerializer, JsonSerializer, MsgpackSerializer]
+}
+
+
+def get_serializer(name: str):
+    assert name in SERIALIZERS, f"Invalid serializer: {name}"
+    return SERIALIZERS[name]
+
+
+def detect_serializer(experiment_path: str) -> Optional[type]:
+    """
+    Finds the serializer an experiment was logged with from its meta file.
+
+    Args:
+        experiment_path (str): The experiment directory.
+
+    Returns:
+        The serializer, or None if the directory has no meta file.
+    """
+    for serializer in SERIALIZERS.values():
+        if os.path.isfile(os.path.join(experiment_path, f"meta{serializer.extension}")):
+            return serializer
+    return None
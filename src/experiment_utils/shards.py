@@ -0,0 +1,80 @@
+from typing import Optional
+import os
+
+import numpy as np
+
+from .utils import compare_fns, read_file
+
+
+SHARDS_DIR = "shards"
+
+
+def shard_path(experiment_path: str, shard: str) -> str:
+    assert (
+        shard and os.sep not in shard and shard not in (".", "..")
+    ), f"Invalid shard: {shard}"
+    return os.path.join(experiment_path, SHARDS_DIR, shard)
+
+
+def shard_paths(experiment_path: str) -> list:
+    path = os.path.join(experiment_path, SHARDS_DIR)
+    if not os.path.isdir(path):
+        return []
+    with os.scandir(path) as entries:
+        return sorted(
+            os.path.join(path, entry.name) for entry in entries if entry.is_dir()
+        )
+
+
+def merge_shards(
+    experiment_path: str,
+    serializer,
+    params: Optional[dict] = None,
+    values: Optional[dict] = None,
+):
+    """
+    Merges the params and value summaries every shard of an experiment wrote
+    on top of the experiment's own.
+
+    Each shard keeps its summary as ``{key: {value, compare_fn, time}}`` so
+    summaries can be combined with the compare function they were logged
+    with, and "last" values resolve to the most recently logged one.
+
+    Args:
+        experiment_path (str): The experiment directory.
+        serializer: The serializer the experiment was logged with.
+        params (dict, optional): The experiment's own params.
+        values (dict, optional): The experiment's own values.
+
+    Returns:
+        tuple: The merged params and values, unchanged if there are no shards.
+    """
+    paths = shard_paths(experiment_path)
+    if not paths:
+        return params, values
+    params = {} if params is None else params
+    values = {} if values is None else values
+
+    entries = []
+    for path in paths:
+        file = os.path.join(path, f"params{serializer.extension}")
+        if os.path.isfile(file):
+            params.update(read_file(file, serializer) or {})
+        file = os.path.join(path, f"summary{serializer.extension}")
+        if os.path.isfile(file):
+            entries.extend((read_file(file, serializer) or {}).items())
+
+    for key_, entry in sorted(entries, key=lambda item: item[1]["time"]):
+        compare_fn = getattr(compare_fns, entry["compare_fn"], compare_fns.new)
+        values[key_] = compare_fn(entry["value"], values.get(key_, None))
+    params = {k: params[k] for k in sorted(params)}
+    values = {k: values[k] for k in sorted(values)}
+    return params, values
+
+
+def merge_records(records: list) -> np.ndarray:
+    """
+    Merges the series records of several shards into one ordered by step.
+    """
+    records = np.concatenate(records)
+    return records[np.argsort(records["step"], kind="stable")]
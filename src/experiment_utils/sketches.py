@@ -0,0 +1,138 @@
+from typing import Optional, Sequence
+import base64
+
+import numpy as np
+
+
+def encode_array(array: np.ndarray) -> str:
+    """
+    Packs a float array into a base64 string of little-endian doubles, which
+    every serializer stores far more compactly than a list of floats.
+    """
+    return base64.b64encode(np.ascontiguousarray(array, dtype="<f8")).decode("ascii")
+
+
+def decode_array(data: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype="<f8").copy()
+
+
+class TDigest:
+    """
+    Mergeable streaming quantile sketch (merging t-digest).
+
+    Points are kept as weighted centroids that are small near the tails and
+    large around the median, so extreme quantiles stay accurate with a
+    bounded number of centroids. Values are buffered and absorbed in batches
+    with sorting and ``np.add.reduceat`` rather than per point loops.
+
+    Args:
+        compression (float, optional): Roughly the number of centroids kept.
+    """
+
+    def __init__(self, compression: float = 100):
+        assert compression > 0, f"Invalid compression: {compression}"
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+        self._num_buffered = 0
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum()) + self._num_buffered
+
+    def update(self, values: Sequence[float]) -> None:
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._buffer.append(values)
+        self._num_buffered += len(values)
+        # Logging one value at a time must not compress every time
+        if self._num_buffered >= 5 * self.compression:
+            self._absorb()
+
+    def _absorb(self) -> None:
+        if not self._buffer:
+            return
+        values = np.concatenate(self._buffer)
+        self._buffer = []
+        self._num_buffered = 0
+        self._compress(
+            np.concatenate([self.means, values]),
+            np.concatenate([self.weights, np.ones(len(values))]),
+        )
+
+    def merge(self, other: "TDigest") -> None:
+        self._absorb()
+        other._absorb()
+        if not len(other.means):
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights]),
+        )
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        # k1 scale function, every centroid spans at most one unit of k
+        k = self.compression / np.pi * np.arcsin(2 * q - 1)
+        buckets = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        """
+        Estimates one or more quantiles, ``q`` in [0, 1].
+        """
+        self._absorb()
+        if not len(self.means):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        cumulative = np.cumsum(self.weights)
+        positions = np.r_[0, cumulative - self.weights / 2, cumulative[-1]]
+        means = np.r_[self.min, self.means, self.max]
+        return np.interp(np.asarray(q) * cumulative[-1], positions, means)
+
+    def state(self) -> dict:
+        self._absorb()
+        return {
+            "compression": self.compression,
+            "means": encode_array(self.means),
+            "weights": encode_array(self.weights),
+            # JSON has no infinity, an empty digest stores no bounds
+            "min": self.min if len(self.means) else None,
+            "max": self.max if len(self.means) else None,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "TDigest":
+        digest = cls(compression=state["compression"])
+        digest.means = decode_array(state["means"])
+        digest.weights = decode_array(state["weights"])
+        if len(digest.means):
+            digest.min = state["min"]
+            digest.max = state["max"]
+        return digest
+
+    @classmethod
+    def merged(cls, digests: Sequence["TDigest"]) -> Optional["TDigest"]:
+        digests = list(digests)
+        if not digests:
+            return None
+        digest = cls(compression=max(d.compression for d in digests))
+        for other in digests:
+            digest.merge(other)
+        return digest
+
+    def __repr__(self):
+        return f"TDigest(compression={self.compression}, count={self.count:g})"
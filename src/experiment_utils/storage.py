@@ -0,0 +1,777 @@
+from collections import OrderedDict
+from typing import Any, Optional, Sequence, Tuple, TYPE_CHECKING
+import csv
+import io
+import os
+import struct
+import time
+
+import numpy as np
+
+from .utils import fsync_path
+
+# pandas is only needed to read series back, keep it off the Logger import path
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+SERIES_DTYPE = np.dtype([("step", "<i8"), ("value", "<f8")])
+# CSV series holding anything but numbers, e.g. strings, keep their values
+OBJECT_SERIES_DTYPE = np.dtype([("step", "<i8"), ("value", "O")])
+LOG_DTYPE = np.dtype(
+    [("key", "<u4"), ("step", "<i8"), ("value", "<f8"), ("time", "<f8")]
+)
+LOG_INDEX_DTYPE = np.dtype([("key", "<u4"), ("start", "<i8"), ("rows", "<i8")])
+
+
+def _fill_steps(steps: Sequence, start: int) -> np.ndarray:
+    # Binary stores have an int64 step column, so values logged without a
+    # step get their running index within the series instead
+    steps = np.asarray(steps)
+    if steps.dtype != object:
+        return steps.astype(SERIES_DTYPE["step"], copy=False)
+    missing = np.equal(steps, None)
+    steps = np.where(missing, start + np.arange(len(steps)), steps)
+    return steps.astype(SERIES_DTYPE["step"])
+
+
+class SeriesView:
+    """
+    Lazy view over the step/value records of one series. Segments are
+    memory-mapped where the storage allows it, so selecting a step range or
+    the last few points only touches the pages holding them. Step lookups
+    assume steps were logged in increasing order.
+    """
+
+    def __init__(self, segments: Sequence[np.ndarray]):
+        self.segments = [segment for segment in segments if len(segment)]
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self.segments)
+
+    def records(self) -> np.ndarray:
+        if not self.segments:
+            return np.empty(0, dtype=SERIES_DTYPE)
+        if len(self.segments) == 1:
+            return self.segments[0]
+        return np.concatenate(self.segments)
+
+    def range(self, start: Optional[int] = None, stop: Optional[int] = None):
+        """
+        Returns the records with ``start <= step < stop``.
+        """
+        selected = []
+        for segment in self.segments:
+            steps = segment["step"]
+            if stop is not None and steps[0] >= stop:
+                break
+            if start is not None and steps[-1] < start:
+                continue
+            lo = 0 if start is None else np.searchsorted(steps, start, "left")
+            hi = len(steps) if stop is None else np.searchsorted(steps, stop, "left")
+            selected.append(segment[lo:hi])
+        return SeriesView(selected).records()
+
+    def search(self, step: int) -> int:
+        """
+        Returns the position of the first record with a step of at least
+        ``step``.
+        """
+        offset = 0
+        for segment in self.segments:
+            if segment["step"][-1] >= step:
+                return offset + int(np.searchsorted(segment["step"], step, "left"))
+            offset += len(segment)
+        return offset
+
+    def slice(self, i: int, j: int) -> np.ndarray:
+        """
+        Returns the records at positions ``i`` up to ``j``.
+        """
+        selected = []
+        offset = 0
+        for segment in self.segments:
+            if offset >= j:
+                break
+            if offset + len(segment) > i:
+                selected.append(segment[max(i - offset, 0) : j - offset])
+            offset += len(segment)
+        return SeriesView(selected).records()
+
+    def chunks(self, rows: int):
+        """
+        Yields the records in consecutive chunks of ``rows``, only the last
+        one may be shorter.
+        """
+        for i in range(0, len(self), rows):
+            yield self.slice(i, i + rows)
+
+    def tail(self, k: int) -> np.ndarray:
+        """
+        Returns the last ``k`` records.
+        """
+        selected = []
+        for segment in reversed(self.segments):
+            if k <= 0:
+                break
+            selected.append(segment[-k:])
+            k -= len(selected[-1])
+        return SeriesView(selected[::-1]).records()
+
+    @staticmethod
+    def to_frame(records: np.ndarray, column: str = "value") -> "pd.DataFrame":
+        import pandas as pd
+
+        return pd.DataFrame(
+            {column: records["value"]},
+            index=pd.Index(records["step"], name="step"),
+        )
+
+    @classmethod
+    def from_frame(cls, df: "pd.DataFrame", start: int = 0) -> "SeriesView":
+        """
+        Wraps a frame with a step index and one value column, such as a
+        parsed CSV series. Missing steps get the running index within the
+        series like in the binary storages, ``start`` being that of the first
+        row. Values other than numbers are kept as objects.
+        """
+        values = df.iloc[:, 0].to_numpy()
+        dtype = SERIES_DTYPE if values.dtype.kind in "biuf" else OBJECT_SERIES_DTYPE
+        records = np.empty(len(df), dtype=dtype)
+        steps = np.array(df.index.to_numpy(dtype="float64", na_value=np.nan))
+        missing = np.isnan(steps)
+        steps[missing] = start + np.flatnonzero(missing)
+        records["step"] = steps
+        records["value"] = values
+        return cls([records])
+
+
+class OpenFiles:
+    """
+    Handles kept open per key, at most ``max_open`` at a time so thousands
+    of keys never exhaust the process' file descriptors. The least recently
+    used handle is closed beyond that and reopened when needed again.
+    """
+
+    def __init__(self, max_open: int = 128):
+        assert max_open > 0, f"Invalid number of open files: {max_open}"
+        self.max_open = max_open
+        self._files = OrderedDict()
+        # Files closed since the last flush still have to be fsynced
+        self._closed = set()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._files
+
+    def get(self, key: str):
+        f = self._files.get(key)
+        if f is not None:
+            self._files.move_to_end(key)
+        return f
+
+    def put(self, key: str, f) -> None:
+        self._files[key] = f
+        while len(self._files) > self.max_open:
+            _, evicted = self._files.popitem(last=False)
+            self._close(evicted)
+
+    def pop(self, key: str) -> None:
+        self._close(self._files.pop(key))
+
+    def _close(self, f) -> None:
+        f.close()
+        self._closed.add(f.name)
+
+    def flush(self, fsync: bool = False) -> None:
+        for f in self._files.values():
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        if fsync:
+            for path in self._closed:
+                fsync_path(path)
+        self._closed = set()
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files = OrderedDict()
+        self._closed = set()
+
+
+class CSVStorage:
+    """
+    Stores each series as a ``<key>.csv`` file with a step and value column.
+    Unlike the binary storages it also holds values other than numbers.
+    """
+
+    name = "csv"
+    numeric_only = False
+    # Parsing is costly enough to keep parsed series in a SeriesCache
+    cacheable = True
+
+    def __init__(self, values_path: str, max_open: int = 128):
+        self.values_path = values_path
+        self._files = OpenFiles(max_open)
+
+    def append(self, key: str, steps: Sequence, values: Sequence) -> None:
+        f = self._get_file(key)
+        csv.writer(f).writerows(zip(steps, values))
+
+    def flush(self, fsync: bool = False, explicit: bool = False) -> None:
+        self._files.flush(fsync)
+
+    def close(self) -> None:
+        self._files.close()
+
+    def _get_file(self, key: str):
+        # Keep append handles of recent keys open instead of reopening per write
+        f = self._files.get(key)
+        if f is None:
+            if not os.path.isdir(self.values_path):
+                os.makedirs(self.values_path)
+            f = open(os.path.join(self.values_path, f"{key}.csv"), "a", newline="")
+            if f.tell() == 0:
+                csv.writer(f).writerow(["step", "value"])
+            self._files.put(key, f)
+        return f
+
+    @staticmethod
+    def files(values_path: str, key: str) -> list:
+        file = os.path.join(values_path, f"{key}.csv")
+        return [file] if os.path.isfile(file) else []
+
+    @staticmethod
+    def read(values_path: str, key: str) -> Optional["pd.DataFrame"]:
+        import pandas as pd
+
+        file = os.path.join(values_path, f"{key}.csv")
+        if not os.path.isfile(file):
+            return None
+        return pd.read_csv(file, index_col=0)
+
+    @classmethod
+    def open(cls, values_path: str, key: str) -> Optional[SeriesView]:
+        df = cls.read(values_path, key)
+        return None if df is None else SeriesView.from_frame(df)
+
+    @staticmethod
+    def tail(
+        values_path: str, key: str, cursor: Any = None
+    ) -> Tuple[np.ndarray, Any]:
+        """
+        Returns the records appended since ``cursor``, None for the start of
+        the series, and the cursor to pass next time. Only the bytes past the
+        last complete row read are parsed.
+        """
+        import pandas as pd
+
+        offset, rows = (0, 0) if cursor is None else cursor
+        file = os.path.join(values_path, f"{key}.csv")
+        if not os.path.isfile(file):
+            return np.empty(0, dtype=SERIES_DTYPE), cursor
+        with open(file, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        if offset == 0:
+            # Skip the header row
+            header = data.find(b"\n") + 1
+            data, offset = data[header:], header
+        # A row still being written is left for the next call
+        data = data[: data.rfind(b"\n") + 1]
+        if not data:
+            return np.empty(0, dtype=SERIES_DTYPE), cursor
+        df = pd.read_csv(
+            io.BytesIO(data), header=None, names=["step", "value"], index_col=0
+        )
+        records = SeriesView.from_frame(df, rows).records()
+        return records, (offset + len(data), rows + len(records))
+
+
+class NumpyStorage:
+    """
+    Stores each series as chunked ``.npy`` segments under ``<key>/`` holding
+    int64 step and float64 value records. Segments are appended to in place
+    and only the header's row count is rewritten, so every segment is always
+    a valid ``.npy`` file that can be loaded or memory-mapped while it grows.
+    """
+
+    name = "npy"
+    numeric_only = True
+    extension = ".npy"
+    header_size = 128
+    # Segments are memory-mapped, caching a copy would not save any parsing
+    cacheable = False
+
+    def __init__(
+        self, values_path: str, segment_rows: int = 1 << 20, max_open: int = 128
+    ):
+        assert segment_rows > 0, f"Invalid segment size: {segment_rows}"
+        self.values_path = values_path
+        self.segment_rows = segment_rows
+        self._files = OpenFiles(max_open)
+        self._rows = {}
+        self._counts = {}
+
+    def append(self, key: str, steps: Sequence, values: Sequence) -> None:
+        if key not in self._counts:
+            self._counts[key] = sum(
+                len(segment) for segment in self.segments(self.values_path, key)
+            )
+        records = np.empty(len(steps), dtype=SERIES_DTYPE)
+        records["value"] = values
+        records["step"] = _fill_steps(steps, self._counts[key])
+        self._counts[key] += len(records)
+
+        while len(records):
+            f = self._get_file(key)
+            n = min(len(records), self.segment_rows - self._rows[key])
+            f.seek(0, os.SEEK_END)
+            f.write(records[:n].tobytes())
+            self._rows[key] += n
+            f.seek(0)
+            f.write(self._header(self._rows[key]))
+            records = records[n:]
+
+    def flush(self, fsync: bool = False, explicit: bool = False) -> None:
+        self._files.flush(fsync)
+
+    def close(self) -> None:
+        self._files.close()
+        self._rows = {}
+
+    def _get_file(self, key: str):
+        f = self._files.get(key)
+        if f is not None and self._rows[key] < self.segment_rows:
+            return f
+        if f is not None:
+            self._files.pop(key)
+
+        path = os.path.join(self.values_path, key)
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        names = sorted(n for n in os.listdir(path) if n.endswith(self.extension))
+        if names and f is None:
+            # Resume the last segment if it still has room, its header always
+            # holds the rows written so far
+            file = os.path.join(path, names[-1])
+            rows = len(np.load(file, mmap_mode="r"))
+            if rows < self.segment_rows:
+                f = open(file, "r+b")
+                self._files.put(key, f)
+                self._rows[key] = rows
+                return f
+        file = os.path.join(path, f"{len(names):08d}{self.extension}")
+        f = open(file, "w+b")
+        f.write(self._header(0))
+        self._files.put(key, f)
+        self._rows[key] = 0
+        return f
+
+    @classmethod
+    def _header(cls, rows: int) -> bytes:
+        # Fixed-size header so the row count can be rewritten in place
+        header = repr(
+            {
+                "descr": np.lib.format.dtype_to_descr(SERIES_DTYPE),
+                "fortran_order": False,
+                "shape": (rows,),
+            }
+        ).encode("latin1")
+        header = header.ljust(cls.header_size - 10 - 1) + b"\n"
+        return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header
+
+    @classmethod
+    def files(cls, values_path: str, key: str) -> list:
+        path = os.path.join(values_path, key)
+        if not os.path.isdir(path):
+            return []
+        return [
+            os.path.join(path, name)
+            for name in sorted(os.listdir(path))
+            if name.endswith(cls.extension)
+        ]
+
+    @classmethod
+    def segments(cls, values_path: str, key: str, mmap_mode: Optional[str] = "r"):
+        return [
+            np.load(file, mmap_mode=mmap_mode) for file in cls.files(values_path, key)
+        ]
+
+    @classmethod
+    def open(cls, values_path: str, key: str) -> Optional[SeriesView]:
+        segments = cls.segments(values_path, key)
+        return SeriesView(segments) if segments else None
+
+    @classmethod
+    def read(cls, values_path: str, key: str) -> Optional["pd.DataFrame"]:
+        view = cls.open(values_path, key)
+        return None if view is None else SeriesView.to_frame(view.records())
+
+    @classmethod
+    def tail(
+        cls, values_path: str, key: str, cursor: Any = None
+    ) -> Tuple[np.ndarray, Any]:
+        """
+        Returns the records appended since ``cursor``, a segment number and
+        row within it, and the cursor to pass next time. Only new rows are
+        memory-mapped.
+        """
+        segment, rows = (0, 0) if cursor is None else cursor
+        path = os.path.join(values_path, key)
+        if not os.path.isdir(path):
+            return np.empty(0, dtype=SERIES_DTYPE), cursor
+        names = sorted(n for n in os.listdir(path) if n.endswith(cls.extension))
+        selected = []
+        for i, name in enumerate(names[segment:], segment):
+            records = np.load(os.path.join(path, name), mmap_mode="r")
+            selected.append(records[rows if i == segment else 0 :])
+            segment, rows = i, len(records)
+        return SeriesView(selected).records(), (segment, rows)
+
+
+class ParquetStorage:
+    """
+    Stores each series as Parquet files under ``<key>/`` with an int64 step
+    and float64 value column. Requires pyarrow.
+
+    Rows are buffered per key and only written out as a new file once a key
+    has ``file_rows`` of them, on explicit or fsyncing flushes and on close,
+    so logging step by step does not create a file per step. Readers only
+    see the rows written out so far.
+    """
+
+    name = "parquet"
+    numeric_only = True
+    extension = ".parquet"
+    cacheable = True
+
+    def __init__(self, values_path: str, file_rows: int = 1 << 16):
+        import pyarrow  # noqa: F401
+
+        assert file_rows > 0, f"Invalid file size: {file_rows}"
+        self.values_path = values_path
+        self.file_rows = file_rows
+        self._rows = {}
+        self._num_rows = {}
+        self._counts = {}
+
+    def append(self, key: str, steps: Sequence, values: Sequence) -> None:
+        # Batch rows per key so each flush writes a single row group
+        if key not in self._counts:
+            table = self._read_table(self.values_path, key)
+            self._counts[key] = 0 if table is None else table.num_rows
+        # Converted before any state changes, so invalid values leave none behind
+        values = np.asarray(values, dtype=SERIES_DTYPE["value"])
+        steps = _fill_steps(steps, self._counts[key])
+        self._counts[key] += len(steps)
+        rows = self._rows.setdefault(key, ([], []))
+        rows[0].append(steps)
+        rows[1].append(values)
+        self._num_rows[key] = self._num_rows.get(key, 0) + len(steps)
+
+    def flush(self, fsync: bool = False, explicit: bool = False) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        keys = [
+            key
+            for key in self._rows
+            if fsync or explicit or self._num_rows[key] >= self.file_rows
+        ]
+        for key in keys:
+            steps, values = self._rows.pop(key)
+            del self._num_rows[key]
+            path = os.path.join(self.values_path, key)
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            index = len([n for n in os.listdir(path) if n.endswith(self.extension)])
+            table = pa.table(
+                {"step": np.concatenate(steps), "value": np.concatenate(values)}
+            )
+            file = os.path.join(path, f"{index:08d}{self.extension}")
+            pq.write_table(table, file)
+            if fsync:
+                fsync_path(file)
+
+    def close(self) -> None:
+        self.flush(explicit=True)
+
+    @classmethod
+    def files(cls, values_path: str, key: str) -> list:
+        path = os.path.join(values_path, key)
+        if not os.path.isdir(path):
+            return []
+        return [
+            os.path.join(path, name)
+            for name in sorted(os.listdir(path))
+            if name.endswith(cls.extension)
+        ]
+
+    @classmethod
+    def _read_table(cls, values_path: str, key: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        files = cls.files(values_path, key)
+        if not files:
+            return None
+        return pa.concat_tables(pq.read_table(file) for file in files)
+
+    @classmethod
+    def read(cls, values_path: str, key: str) -> Optional["pd.DataFrame"]:
+        table = cls._read_table(values_path, key)
+        if table is None:
+            return None
+        return table.to_pandas().set_index("step")
+
+    @classmethod
+    def open(cls, values_path: str, key: str) -> Optional[SeriesView]:
+        df = cls.read(values_path, key)
+        return None if df is None else SeriesView.from_frame(df)
+
+    @classmethod
+    def tail(
+        cls, values_path: str, key: str, cursor: Any = None
+    ) -> Tuple[np.ndarray, Any]:
+        """
+        Returns the records of the files written since ``cursor``, the number
+        of files already read, and the cursor to pass next time.
+        """
+        import pyarrow.parquet as pq
+
+        num_files = cursor or 0
+        path = os.path.join(values_path, key)
+        if not os.path.isdir(path):
+            return np.empty(0, dtype=SERIES_DTYPE), cursor
+        names = sorted(n for n in os.listdir(path) if n.endswith(cls.extension))
+        selected = []
+        for name in names[num_files:]:
+            table = pq.read_table(os.path.join(path, name))
+            records = np.empty(table.num_rows, dtype=SERIES_DTYPE)
+            records["step"] = table.column("step").to_numpy()
+            records["value"] = table.column("value").to_numpy()
+            selected.append(records)
+        return SeriesView(selected).records(), len(names)
+
+
+class LogStorage:
+    """
+    Stores every series of an experiment in a single append-only
+    ``records.bin`` of key id, step, value and timestamp records, with the
+    key of every id listed in ``keys.txt``. Rows are buffered per key and
+    written out as one contiguous run once a key has ``run_rows`` of them,
+    on explicit or fsyncing flushes and on close. The key, first row and
+    length of every run are appended to ``index.bin``, which thus stays
+    about ``run_rows`` times smaller than the records, and reading one series
+    only touches its runs. Suits experiments logging thousands of keys, which
+    would otherwise take a file each. Readers only see the runs written out
+    so far.
+    """
+
+    name = "log"
+    numeric_only = True
+    records_file = "records.bin"
+    keys_file = "keys.txt"
+    index_file = "index.bin"
+    # Runs are gathered from a memory-map, and every key shares the same files
+    cacheable = False
+
+    def __init__(self, values_path: str, run_rows: int = 256):
+        assert run_rows > 0, f"Invalid run size: {run_rows}"
+        self.values_path = values_path
+        self.run_rows = run_rows
+        self._files = None
+        self._key_ids = {}
+        self._counts = {}
+        self._num_rows = 0
+        self._rows = {}
+        self._num_buffered = {}
+
+    def append(self, key: str, steps: Sequence, values: Sequence) -> None:
+        if self._files is None:
+            self._open_files()
+        # Converted before any state changes, so invalid values leave none behind
+        values = np.asarray(values, dtype=LOG_DTYPE["value"])
+        steps = _fill_steps(steps, self._counts.get(key, 0))
+        self._counts[key] = self._counts.get(key, 0) + len(steps)
+        rows = self._rows.setdefault(key, ([], [], []))
+        rows[0].append(steps)
+        rows[1].append(values)
+        rows[2].append(np.full(len(steps), time.time()))
+        self._num_buffered[key] = self._num_buffered.get(key, 0) + len(steps)
+
+    def flush(self, fsync: bool = False, explicit: bool = False) -> None:
+        if self._files is None:
+            return
+        keys, records, index = self._files
+        # Writing every key on every flush would index a run per logged row
+        flushed = [
+            key
+            for key in self._rows
+            if fsync or explicit or self._num_buffered[key] >= self.run_rows
+        ]
+        runs = np.empty(len(flushed), dtype=LOG_INDEX_DTYPE)
+        for i, key in enumerate(flushed):
+            steps, values, times = self._rows.pop(key)
+            del self._num_buffered[key]
+            if key not in self._key_ids:
+                self._key_ids[key] = len(self._key_ids)
+                keys.write(f"{key}\n".encode())
+            run = np.empty(sum(map(len, steps)), dtype=LOG_DTYPE)
+            run["key"] = self._key_ids[key]
+            run["step"] = np.concatenate(steps)
+            run["value"] = np.concatenate(values)
+            run["time"] = np.concatenate(times)
+            records.write(run.tobytes())
+            runs[i] = (self._key_ids[key], self._num_rows, len(run))
+            self._num_rows += len(run)
+
+        # Readers trust the index, so it only points at rows already written
+        for f in (keys, records):
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        index.write(runs.tobytes())
+        index.flush()
+        if fsync:
+            os.fsync(index.fileno())
+
+    def close(self) -> None:
+        self.flush(explicit=True)
+        for f in self._files or []:
+            f.close()
+        self._files = None
+
+    def _open_files(self) -> None:
+        if not os.path.isdir(self.values_path):
+            os.makedirs(self.values_path)
+        paths = [
+            os.path.join(self.values_path, name)
+            for name in (self.keys_file, self.records_file, self.index_file)
+        ]
+        keys = self._read_keys(self.values_path)
+        index = self._read_index(self.values_path)
+        self._num_rows = int((index["start"] + index["rows"]).max(initial=0))
+        # Drop whatever an interrupted flush left past the last complete run
+        sizes = [
+            sum(len(key.encode()) + 1 for key in keys),
+            self._num_rows * LOG_DTYPE.itemsize,
+            len(index) * LOG_INDEX_DTYPE.itemsize,
+        ]
+        for path, size in zip(paths, sizes):
+            if os.path.isfile(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+        self._key_ids = {key: i for i, key in enumerate(keys)}
+        counts = np.bincount(index["key"], index["rows"], minlength=len(keys))
+        self._counts = {key: int(counts[i]) for i, key in enumerate(keys)}
+        self._files = [open(path, "ab") for path in paths]
+
+    @classmethod
+    def _read_keys(cls, values_path: str) -> list:
+        file = os.path.join(values_path, cls.keys_file)
+        if not os.path.isfile(file):
+            return []
+        with open(file, "rb") as f:
+            data = f.read()
+        # A key still being written is left out
+        return data[: data.rfind(b"\n") + 1].decode().splitlines()
+
+    @classmethod
+    def _read_index(cls, values_path: str, start: int = 0) -> np.ndarray:
+        file = os.path.join(values_path, cls.index_file)
+        if not os.path.isfile(file):
+            return np.empty(0, dtype=LOG_INDEX_DTYPE)
+        count = os.path.getsize(file) // LOG_INDEX_DTYPE.itemsize - start
+        if count <= 0:
+            return np.empty(0, dtype=LOG_INDEX_DTYPE)
+        return np.fromfile(
+            file,
+            dtype=LOG_INDEX_DTYPE,
+            count=count,
+            offset=start * LOG_INDEX_DTYPE.itemsize,
+        )
+
+    @classmethod
+    def _gather(cls, values_path: str, runs: np.ndarray) -> np.ndarray:
+        records = np.empty(int(runs["rows"].sum()), dtype=SERIES_DTYPE)
+        if not len(records):
+            return records
+        data = np.memmap(
+            os.path.join(values_path, cls.records_file),
+            dtype=LOG_DTYPE,
+            mode="r",
+            shape=(int((runs["start"] + runs["rows"]).max()),),
+        )
+        # Row numbers of every run back to back
+        offsets = np.cumsum(runs["rows"]) - runs["rows"]
+        rows = np.repeat(runs["start"] - offsets, runs["rows"])
+        rows += np.arange(len(records))
+        selected = data[rows]
+        records["step"] = selected["step"]
+        records["value"] = selected["value"]
+        return records
+
+    @classmethod
+    def files(cls, values_path: str, key: str) -> list:
+        if key not in cls._read_keys(values_path):
+            return []
+        return [
+            os.path.join(values_path, name)
+            for name in (cls.keys_file, cls.records_file, cls.index_file)
+        ]
+
+    @classmethod
+    def open(cls, values_path: str, key: str) -> Optional[SeriesView]:
+        keys = cls._read_keys(values_path)
+        if key not in keys:
+            return None
+        index = cls._read_index(values_path)
+        runs = index[index["key"] == keys.index(key)]
+        return SeriesView([cls._gather(values_path, runs)])
+
+    @classmethod
+    def read(cls, values_path: str, key: str) -> Optional["pd.DataFrame"]:
+        view = cls.open(values_path, key)
+        return None if view is None else SeriesView.to_frame(view.records())
+
+    @classmethod
+    def tail(
+        cls, values_path: str, key: str, cursor: Any = None
+    ) -> Tuple[np.ndarray, Any]:
+        """
+        Returns the records of the runs indexed since ``cursor``, the number
+        of index entries already read, and the cursor to pass next time.
+        """
+        num_runs = cursor or 0
+        keys = cls._read_keys(values_path)
+        if key not in keys:
+            return np.empty(0, dtype=SERIES_DTYPE), cursor
+        index = cls._read_index(values_path, num_runs)
+        runs = index[index["key"] == keys.index(key)]
+        return cls._gather(values_path, runs), num_runs + len(index)
+
+
+STORAGES = {
+    storage.name: storage
+    for storage in [CSVStorage, NumpyStorage, ParquetStorage, LogStorage]
+}
+
+
+def get_storage(name: str):
+    assert name in STORAGES, f"Invalid storage: {name}"
+    return STORAGES[name]
+
+
+def export_csv(values_path: str, storage: str, key: str) -> None:
+    """
+    Writes a series from a binary storage to ``<key>.csv`` next to it.
+
+    Args:
+        values_path (str): The experiment's values directory.
+        storage (str): The name of the storage the series was logged with.
+        key (str): The series to export.
+    """
+    df = get_storage(storage).read(values_path, key)
+    assert df is not None, f"Missing value: {key}"
+    df.to_csv(os.path.join(values_path, f"{key}.csv"))
@@ -1,9 +1,15 @@
-from typing import Any
+from typing import Any, Optional, TYPE_CHECKING
 import datetime
 import random
-import yaml
 import os
-import pandas as pd
+import tempfile
+
+import numpy as np
+
+from .serializers import YamlSerializer, detect_serializer
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class compare_fns:
@@ -24,27 +30,162 @@ class compare_fns:
         return new if new < old else old
 
 
-def update_yaml(file_path, new_data):
+def read_file(file_path, serializer=YamlSerializer):
+    with open(file_path, "rb") as f:
+        return serializer.loads(f.read())
+
+
+def summary_key(key: str, compare_fn) -> str:
+    return f"{"last" if compare_fn is compare_fns.new else "best"}_{key}"
+
+
+FSYNC_POLICIES = ("always", "flush", "never")
+
+
+def fsync_path(path):
+    """
+    Flushes a file, or a directory entry on POSIX, to stable storage.
+    """
+    if os.path.isdir(path) and os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+_UMASK = None
+
+
+def _umask():
+    # Reading the umask means setting it, so it is read once per process
+    # rather than racing with threads creating files
+    global _UMASK
+    if _UMASK is None:
+        _UMASK = os.umask(0o022)
+        os.umask(_UMASK)
+    return _UMASK
+
+
+def write_file(file_path, data, serializer=YamlSerializer, fsync=False):
+    """
+    Atomically replaces a file so readers never see it empty or half written.
+
+    Args:
+        file_path (str): The file to write.
+        data: The data to serialize.
+        serializer (optional): The serializer to write with. Defaults to YAML.
+        fsync (bool, optional): Flush the file and its directory entry to
+            stable storage before returning. Defaults to False.
+    """
+    directory, name = os.path.split(file_path)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory or ".", prefix=f".{name}.", suffix=".tmp"
+    )
+    try:
+        # Temporary files are private, keep the mode of the replaced file or
+        # the one a plain open() would create so other users can still read
+        if os.path.isfile(file_path):
+            mode = os.stat(file_path).st_mode & 0o777
+        else:
+            mode = 0o666 & ~_umask()
+        os.chmod(tmp_path, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(serializer.dumps(data))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if fsync:
+        fsync_path(directory or ".")
+
+
+def update_file(file_path, new_data, serializer=YamlSerializer, fsync=False):
     if os.path.isfile(file_path):
-        with open(file_path, "r") as f:
-            data = yaml.safe_load(f)
-            data.update(new_data)
+        data = read_file(file_path, serializer)
+        data.update(new_data)
     else:
         data = new_data
     data = {k: data[k] for k in sorted(data)}
-    yaml.dump(
-        data,
-        open(file_path, "w"),
+    write_file(file_path, data, serializer, fsync=fsync)
+
+
+def update_yaml(file_path, new_data):
+    update_file(file_path, new_data, YamlSerializer)
+
+
+def load_experiment(experiment_path):
+    """
+    Loads an experiment's meta, params and values files in whichever format
+    the experiment was logged with, replaying any newer event log records,
+    merging the files of every shard and adding the tracked aggregates.
+
+    Args:
+        experiment_path (str): The experiment directory.
+
+    Returns:
+        dict: The parsed files keyed by name, or None if the directory is not
+            an experiment.
+    """
+    # wal and shards build on the helpers in this module
+    from .wal import replay_events
+    from .shards import merge_shards, shard_paths
+    from .aggregators import load_aggregates, aggregate_results
+
+    serializer = detect_serializer(experiment_path)
+    if serializer is None:
+        return None
+
+    experiment = {}
+    for file_name in ["meta", "params", "values"]:
+        file = os.path.join(experiment_path, f"{file_name}{serializer.extension}")
+        if not os.path.isfile(file):
+            continue
+        experiment[file_name] = read_file(file, serializer)
+
+    # Bring the materialized files up to date with the event log, if any
+    params, values = replay_events(
+        experiment_path, experiment.get("params"), experiment.get("values")
     )
+    params, values = merge_shards(experiment_path, serializer, params, values)
+    aggregates = load_aggregates(
+        [experiment_path] + shard_paths(experiment_path), serializer
+    )
+    if aggregates:
+        values = aggregate_results(aggregates, values)
+    if params:
+        experiment["params"] = params
+    if values:
+        experiment["values"] = values
+    return experiment
+
+
+ID_TIME_FORMAT = "%y%m%d_%H%M%S"
 
 
 def generate_id():
     global WORDS_LIST
-    timestamp = datetime.datetime.now().strftime("%y%m%d_%H%M%S")
+    timestamp = datetime.datetime.now().strftime(ID_TIME_FORMAT)
     words = random.choices(WORDS_LIST, k=2)
     return f"{timestamp}_{"_".join(words)}"
 
 
+def experiment_time(experiment_id: str):
+    """
+    Returns the local time an experiment was started at from the timestamp
+    its id starts with, or None for ids without one.
+    """
+    try:
+        return datetime.datetime.strptime(experiment_id[:13], ID_TIME_FORMAT)
+    except ValueError:
+        return None
+
+
 def validate_experiment_name(name: str) -> bool:
     return True
     # return (
@@ -78,33 +219,100 @@ def flatten_dict(dd, separator="_", prefix=""):
     return dict(items)
 
 
-def create_dataframe_from_nested_dict(data: dict) -> pd.DataFrame:
+# Strings become categoricals when at most this share of them is distinct
+CATEGORY_RATIO = 0.5
+
+
+def infer_column_dtype(values: list) -> Optional[str]:
+    """
+    Infers the dtype for a column of Python values with NaN for missing ones:
+    "Int64" or "boolean" for integers or booleans, which then stay nullable,
+    "float64" for numbers, "category" for repeated strings, or None to let
+    pandas decide, e.g. for lists or mixed types.
+    """
+    import pandas as pd
+
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind == "integer":
+        return "Int64"
+    if kind == "boolean":
+        return "boolean"
+    if kind in ("floating", "mixed-integer-float"):
+        return "float64"
+    if kind == "string":
+        strings = [value for value in values if isinstance(value, str)]
+        if len(set(strings)) <= CATEGORY_RATIO * len(strings):
+            return "category"
+    return None
+
+
+def _column_array(values: list, dtype: Optional[str]):
+    import pandas as pd
+
+    if dtype is None:
+        return values
+    if dtype == "category":
+        return pd.Categorical(values)
+    if dtype == "float64":
+        return np.array(values, dtype=float)
+    return pd.array(values, dtype=dtype)
+
+
+def create_dataframe_from_nested_dict(
+    data: dict, schema: Optional[dict] = None
+) -> "pd.DataFrame":
     """
     Creates a Pandas DataFrame from a nested dictionary with a two-tier header.
 
+    Values are collected straight into one list per flattened column while
+    the dictionaries are walked, and each column name is only joined and
+    split into the two header levels, at its first underscore, once.
+
     Args:
         data (dict): A dictionary of dictionaries of dictionaries.
+        schema (dict, optional): Dtypes by flattened column name. Columns
+            missing from it have their dtype inferred with infer_column_dtype
+            and added to it. Without a schema pandas infers the dtypes.
 
     Returns:
         pandas.DataFrame: A DataFrame with a two-tier header.
     """
+    import pandas as pd
 
-    # Flatten each inner dictionary
-    flattened_data = {
-        outer_key: flatten_dict(inner_dict) for outer_key, inner_dict in data.items()
-    }
+    num_rows = len(data)
+    columns = {}
+    # Columns of each nested dictionary by their key within it, so the
+    # flattened names are only joined for new columns
+    sections = {}
 
-    # Create a DataFrame from the flattened data
-    df = pd.DataFrame.from_dict(flattened_data, orient="index")
+    def add(row, prefix, dd):
+        section = sections.get(prefix)
+        if section is None:
+            section = sections[prefix] = {}
+        for k, v in dd.items():
+            if isinstance(v, dict):
+                add(row, prefix + "_" + k if prefix else k, v)
+                continue
+            column = section.get(k)
+            if column is None:
+                column = [float("nan")] * num_rows
+                section[k] = columns[prefix + "_" + k if prefix else k] = column
+            column[row] = v
 
-    # Split the columns into two levels
-    split_columns = [
-        col.split("_", 1) for col in df.columns
-    ]  # Split only at the first underscore
+    for row, inner_dict in enumerate(data.values()):
+        add(row, "", inner_dict)
 
-    # Create MultiIndex
-    df.columns = pd.MultiIndex.from_tuples(split_columns)
+    if schema is not None:
+        for key, values in columns.items():
+            if key not in schema:
+                schema[key] = infer_column_dtype(values)
+            columns[key] = _column_array(values, schema[key])
 
+    df = pd.DataFrame(columns, index=list(data))
+    if columns:
+        df.columns = pd.MultiIndex.from_tuples([key.split("_", 1) for key in columns])
+    else:
+        df.columns = pd.MultiIndex.from_arrays([[], []])
     return df
 
 
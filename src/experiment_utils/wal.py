@@ -0,0 +1,155 @@
+from typing import Any, Callable, Optional
+import math
+import numbers
+import os
+import time
+
+from .serializers import JsonSerializer
+from .utils import compare_fns, read_file, write_file, summary_key
+
+
+WAL_FILE = "events.jsonl"
+CHECKPOINT_FILE = "events.checkpoint"
+# JSON has no NaN or infinity (orjson writes them as null), so those floats
+# are logged as {FLOAT_TAG: "nan"} and restored on replay
+FLOAT_TAG = "__float__"
+
+
+def encode_floats(data: Any) -> Any:
+    if isinstance(data, dict):
+        return {key: encode_floats(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [encode_floats(value) for value in data]
+    if isinstance(data, numbers.Real) and not math.isfinite(data):
+        return {FLOAT_TAG: repr(float(data))}
+    return data
+
+
+def decode_floats(data: Any) -> Any:
+    if isinstance(data, dict):
+        if len(data) == 1 and FLOAT_TAG in data:
+            return float(data[FLOAT_TAG])
+        return {key: decode_floats(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [decode_floats(value) for value in data]
+    return data
+
+
+class EventLog:
+    """
+    Append-only log of an experiment's param and value updates, one JSON
+    record per line. The params and values files are only materialized from
+    it at checkpoints, which record how far into the log they are current
+    and then start the log over, so it only ever holds the events since the
+    last checkpoint.
+    """
+
+    def __init__(self, experiment_path: str):
+        self.experiment_path = experiment_path
+        self.path = os.path.join(experiment_path, WAL_FILE)
+        self._file = open(self.path, "ab")
+        # A crash while starting over leaves a checkpoint past the end of the
+        # emptied log, reset it before new events could be hidden behind it
+        if checkpoint_offset(experiment_path) > self._file.tell():
+            self._write_checkpoint(0)
+
+    def log_params(self, params: dict) -> None:
+        self._append({"type": "params", "params": encode_floats(params)})
+
+    def log_value(
+        self, key: str, value: Any, step: Optional[int], compare_fn: Callable
+    ) -> None:
+        self._append(
+            {
+                "type": "value",
+                "key": summary_key(key, compare_fn),
+                "value": encode_floats(value),
+                "step": step,
+                "compare_fn": compare_fn.__name__,
+                "time": time.time(),
+            }
+        )
+
+    def _append(self, event: dict) -> None:
+        self._file.write(JsonSerializer.dumps(event) + b"\n")
+
+    def flush(self, fsync: bool = False) -> None:
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+
+    def checkpoint(self, fsync: bool = False) -> None:
+        """
+        Records that the materialized files cover the whole log so far.
+        """
+        self.flush(fsync=fsync)
+        self._write_checkpoint(self._file.tell(), fsync=fsync)
+        self._file.seek(0)
+        self._file.truncate()
+        self.flush(fsync=fsync)
+        self._write_checkpoint(0, fsync=fsync)
+
+    def _write_checkpoint(self, offset: int, fsync: bool = False) -> None:
+        write_file(
+            os.path.join(self.experiment_path, CHECKPOINT_FILE),
+            {"offset": offset},
+            JsonSerializer,
+            fsync=fsync,
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __repr__(self):
+        return f"EventLog(path={self.path})"
+
+
+def checkpoint_offset(experiment_path: str) -> int:
+    file = os.path.join(experiment_path, CHECKPOINT_FILE)
+    return read_file(file, JsonSerializer)["offset"] if os.path.isfile(file) else 0
+
+
+def replay_events(
+    experiment_path: str,
+    params: Optional[dict] = None,
+    values: Optional[dict] = None,
+):
+    """
+    Applies the events logged after the last checkpoint on top of the
+    materialized params and values.
+
+    Args:
+        experiment_path (str): The experiment directory.
+        params (dict, optional): The materialized params, updated in place.
+        values (dict, optional): The materialized values, updated in place.
+
+    Returns:
+        tuple: The params and values, unchanged if the experiment has no event
+            log.
+    """
+    path = os.path.join(experiment_path, WAL_FILE)
+    if not os.path.isfile(path):
+        return params, values
+    params = {} if params is None else params
+    values = {} if values is None else values
+
+    offset = checkpoint_offset(experiment_path)
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    # A crash can leave a partial last record, it is ignored until completed
+    for line in data[: data.rfind(b"\n") + 1].splitlines():
+        event = JsonSerializer.loads(line)
+        if event["type"] == "params":
+            params.update(decode_floats(event["params"]))
+        elif event["type"] == "value":
+            # Custom compare functions cannot be resolved by name, those
+            # replay as keeping the newest value
+            compare_fn = getattr(compare_fns, event["compare_fn"], compare_fns.new)
+            key_ = event["key"]
+            value = decode_floats(event["value"])
+            if value is None and compare_fn is not compare_fns.new:
+                # Logs written before floats were tagged hold NaN as null
+                value = math.nan
+            values[key_] = compare_fn(value, values.get(key_, None))
+    return params, values
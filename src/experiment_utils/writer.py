@@ -0,0 +1,121 @@
+from typing import Callable
+import atexit
+import queue
+import threading
+
+
+BACKPRESSURE_POLICIES = ("block", "drop_oldest", "grow")
+
+
+class AsyncWriter:
+    def __init__(
+        self,
+        max_queue_size: int = 1024,
+        backpressure: str = "block",
+    ):
+        """
+        Runs submitted calls in order on a dedicated writer thread.
+
+        Args:
+            max_queue_size (int, optional): Maximum number of pending calls.
+            backpressure (str, optional): What to do when the queue is full.
+                "block" waits for space, "drop_oldest" discards the oldest
+                pending call submitted as droppable, or waits if there is
+                none, and "grow" ignores max_queue_size.
+        """
+        assert (
+            backpressure in BACKPRESSURE_POLICIES
+        ), f"Invalid backpressure policy: {backpressure}"
+        assert max_queue_size > 0, f"Invalid queue size: {max_queue_size}"
+        self.backpressure = backpressure
+        self.num_dropped = 0
+        self._queue = queue.Queue(
+            maxsize=0 if backpressure == "grow" else max_queue_size
+        )
+        self._error = None
+        self.closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="experiment_utils-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, fn: Callable, *args, droppable: bool = False, **kwargs) -> None:
+        """
+        Queues ``fn(*args, **kwargs)``. Only droppable calls may be discarded
+        by the "drop_oldest" policy.
+        """
+        assert not self.closed, "Writer is closed"
+        self._raise_error()
+        item = (fn, args, kwargs, droppable)
+        if self.backpressure != "drop_oldest":
+            self._queue.put(item)
+            return
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                pass
+            if not self._drop_oldest():
+                self._queue.put(item)
+                return
+
+    def _drop_oldest(self) -> bool:
+        # Queue.get would take whatever comes first, so the pending calls are
+        # searched under the queue's own lock
+        q = self._queue
+        with q.mutex:
+            for i, pending in enumerate(q.queue):
+                if pending is not None and pending[3]:
+                    del q.queue[i]
+                    q.unfinished_tasks -= 1
+                    if q.unfinished_tasks == 0:
+                        q.all_tasks_done.notify_all()
+                    q.not_full.notify()
+                    self.num_dropped += 1
+                    return True
+        return False
+
+    def flush(self) -> None:
+        """
+        Blocks until every submitted call has run.
+        """
+        self._queue.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """
+        Drains the queue and stops the writer thread.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+        self._raise_error()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                fn, args, kwargs, _ = item
+                try:
+                    fn(*args, **kwargs)
+                except BaseException as e:
+                    if self._error is None:
+                        self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self) -> None:
+        # Surface failures from the writer thread on the caller's thread
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def __repr__(self):
+        return f"AsyncWriter(backpressure={self.backpressure})"
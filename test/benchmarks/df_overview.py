@@ -0,0 +1,85 @@
+"""
+Times building the Dashboard.df overview frame for a large sweep, by default
+10k experiments with 500 params and values each, against the previous
+flatten_dict/from_dict/column split approach. Parsing the files is left out,
+only the frame construction is measured.
+
+Usage: python test/benchmarks/df_overview.py [num_experiments] [num_columns]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from experiment_utils.utils import create_dataframe_from_nested_dict, flatten_dict
+
+NUM_EXPERIMENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+NUM_COLUMNS = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+OPTIMIZERS = ["adam", "adamw", "sgd", "lion"]
+
+
+def make_experiments():
+    rng = random.Random(0)
+    experiments = {}
+    for i in range(NUM_EXPERIMENTS):
+        params = {f"param{j}": rng.random() for j in range(NUM_COLUMNS // 2 - 2)}
+        params["optimizer"] = {"name": rng.choice(OPTIMIZERS), "lr": rng.random()}
+        values = {
+            f"last_metric{j}": rng.random()
+            # Sweeps log different metrics, leave some out
+            for j in range(NUM_COLUMNS // 2)
+            if rng.random() > 0.1
+        }
+        experiments[f"./.logs/experiment{i}"] = {
+            "meta": {"experiment_id": f"experiment{i}", "experiment_name": "sweep"},
+            "params": params,
+            "values": values,
+        }
+    return experiments
+
+
+def previous(data):
+    flattened = {key: flatten_dict(inner) for key, inner in data.items()}
+    df = pd.DataFrame.from_dict(flattened, orient="index")
+    df.columns = pd.MultiIndex.from_tuples([col.split("_", 1) for col in df.columns])
+    return df
+
+
+def measure(fn, data):
+    start = time.perf_counter()
+    df = fn(data)
+    elapsed = time.perf_counter() - start
+    # Tracing slows allocations down, so memory is measured in a second run
+    tracemalloc.start()
+    fn(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return df, elapsed, peak
+
+
+experiments = make_experiments()
+results = {}
+builders = [("previous", previous), ("columnar", create_dataframe_from_nested_dict)]
+for name, fn in builders:
+    df, elapsed, peak = measure(fn, experiments)
+    results[name] = df
+    print(
+        f"{name:>8}: {elapsed:6.2f}s, peak {peak / 2**20:7.1f} MiB, "
+        f"frame {df.memory_usage(deep=True).sum() / 2**20:7.1f} MiB, shape {df.shape}"
+    )
+
+# Dashboard.df also infers nullable and categorical dtypes, e.g. the optimizer
+df, elapsed, peak = measure(
+    lambda data: create_dataframe_from_nested_dict(data, schema={}), experiments
+)
+print(
+    f"inferred: {elapsed:6.2f}s, peak {peak / 2**20:7.1f} MiB, "
+    f"frame {df.memory_usage(deep=True).sum() / 2**20:7.1f} MiB, shape {df.shape}"
+)
+
+pd.testing.assert_frame_equal(
+    results["previous"].sort_index(axis=1), results["columnar"].sort_index(axis=1)
+)
@@ -0,0 +1,55 @@
+"""
+Guards the import time of experiment_utils for training workers that only
+need the Logger: importing it must not load pandas or the plotting stack and
+must stay within IMPORT_BUDGET seconds on top of importing NumPy, which the
+Logger needs anyway and whose own import time varies a lot between machines.
+
+Usage: python test/benchmarks/import_time.py
+"""
+
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ["pandas", "bokeh", "matplotlib", "pyarrow", "IPython"]
+IMPORT_BUDGET = 0.25
+RUNS = 7
+
+
+def best_time(code):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+        times.append(time.perf_counter() - start)
+    return min(times), output.strip()
+
+
+baseline, _ = best_time("pass")
+numpy_baseline, _ = best_time("import numpy")
+elapsed, loaded = best_time(
+    "import sys, experiment_utils\n"
+    "experiment_utils.Logger\n"
+    f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+import_time = elapsed - numpy_baseline
+print(
+    f"import experiment_utils: {import_time * 1000:.1f} ms on top of "
+    f"import numpy: {(numpy_baseline - baseline) * 1000:.1f} ms"
+)
+
+assert not loaded, f"Heavy modules loaded on import: {loaded}"
+assert (
+    import_time < IMPORT_BUDGET
+), f"Import took {import_time:.3f}s over NumPy, budget is {IMPORT_BUDGET:.3f}s"
+
+# Dashboard still resolves lazily
+elapsed, loaded = best_time(
+    "import sys, experiment_utils\n"
+    "experiment_utils.Dashboard\n"
+    "print('bokeh' in sys.modules)"
+)
+assert loaded == "False", "Dashboard must not import bokeh before plotting"
+print(f"import experiment_utils.Dashboard: {(elapsed - baseline) * 1000:.1f} ms")
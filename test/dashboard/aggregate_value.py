@@ -0,0 +1,48 @@
+import experiment_utils
+
+import numpy as np
+import pandas as pd
+import shutil
+import os
+
+if os.path.isdir("./.logs"):
+    shutil.rmtree("./.logs")
+
+# A diverged run with no values at all, a complete one and one that only has
+# values after a stretch of NaNs
+series = {
+    "diverged": [np.nan, np.nan],
+    "complete": [1.0, 2.0],
+    "late": [np.nan] * 5 + [3.0] * 5,
+}
+logger = experiment_utils.Logger()
+for name, values in series.items():
+    logger.start_experiment(name)
+    logger.log_param("run", name)
+    logger.log_series("loss", np.arange(len(values)), np.array(values))
+    logger.end_experiment()
+
+dashboard = experiment_utils.Dashboard()
+df = dashboard.aggregate_value("loss", stats=("mean", "count"))
+assert df.index.tolist() == [0, 1, 5, 6, 7, 8, 9], df
+assert df["mean"].tolist() == [1.0, 2.0, 3.0, 3.0, 3.0, 3.0, 3.0], df
+assert df["count"].tolist() == [1] * 7, df
+
+# Blocks without values are skipped when interpolating onto a step grid,
+# steps outside an experiment's range stay missing
+for chunk, chunk_steps in [(None, None), (1, 3), (2, 4)]:
+    df = dashboard.aggregate_value(
+        "loss",
+        stats=("mean", "count"),
+        steps=[0, 1, 6, 8],
+        chunk=chunk,
+        chunk_steps=chunk_steps,
+    )
+    expected = pd.DataFrame(
+        {"mean": [1.0, 2.0, 3.0, 3.0], "count": [1, 1, 1, 1]},
+        index=pd.Index([0, 1, 6, 8], name="step"),
+    )
+    pd.testing.assert_frame_equal(df, expected)
+
+df = dashboard.aggregate_value("loss", group_by="run", stats=("count",), steps=[1])
+assert df.index.tolist() == [("complete", 1)], df
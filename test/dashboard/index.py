@@ -0,0 +1,65 @@
+import experiment_utils
+from experiment_utils.index import ExperimentIndex, INDEX_FILE
+from experiment_utils.dashboard import experiment_paths
+
+import pandas as pd
+import datetime
+import shutil
+import os
+
+if os.path.isdir("./.logs"):
+    shutil.rmtree("./.logs")
+
+logger = experiment_utils.Logger()
+for i, optimizer in enumerate(["adam", "adam", "sgd", "adam"]):
+    logger.start_experiment("sweep")
+    params = {"seed": i, "optimizer": optimizer, "lr": 0.1 * (i + 1)}
+    if i % 2:
+        params["warmup"] = True
+    logger.log_params(params)
+    logger.log_value("loss", 1.0 / (i + 1))
+    logger.end_experiment()
+
+dashboard = experiment_utils.Dashboard()
+df = dashboard.df()
+assert os.path.isfile(os.path.join("./.logs", INDEX_FILE))
+dtypes = {column: str(dtype) for column, dtype in df.dtypes.items()}
+assert dtypes[("params", "seed")] == "Int64", dtypes
+assert dtypes[("params", "warmup")] == "boolean", dtypes
+assert dtypes[("params", "optimizer")] == "category", dtypes
+assert dtypes[("params", "lr")] == "float64", dtypes
+assert dtypes[("values", "last_loss")] == "float64", dtypes
+
+# The experiments and the inferred schema are served from the index the next
+# time, and come back the same as when parsed and inferred
+index = ExperimentIndex("./.logs")
+digest = index.digest(experiment_paths("./.logs"))
+schema = index.load_schema(digest)
+assert schema is not None
+assert schema["params_seed"] == "Int64", schema
+cached = dashboard.df()
+pd.testing.assert_frame_equal(cached, df)
+pd.testing.assert_frame_equal(experiment_utils.Dashboard(use_index=False).df(), df)
+
+# A new experiment changes the digest, its columns are inferred again
+logger.start_experiment("sweep")
+logger.log_params({"seed": "random", "optimizer": "adam", "lr": 0.5})
+logger.end_experiment()
+assert index.digest(experiment_paths("./.logs")) != digest
+df = dashboard.df()
+assert len(df) == 5
+assert str(df[("params", "seed")].dtype) == "object", df.dtypes
+assert str(df[("params", "optimizer")].dtype) == "category", df.dtypes
+pd.testing.assert_frame_equal(dashboard.df(), df)
+
+# Params that JSON would turn into strings are parsed again rather than served
+# from the index
+logger.start_experiment("sweep")
+logger.log_params({"seed": 5, "start": datetime.date(2024, 1, 1)})
+logger.end_experiment()
+for _ in range(2):
+    experiments = ExperimentIndex("./.logs").load(experiment_paths("./.logs"))
+    starts = [e["params"]["start"] for e in experiments if "start" in e["params"]]
+    assert starts == [datetime.date(2024, 1, 1)], starts
+    start = dashboard.df()[("params", "start")].dropna()
+    assert start.tolist() == [datetime.date(2024, 1, 1)], start
@@ -0,0 +1,63 @@
+import experiment_utils
+from experiment_utils.utils import load_experiment
+from experiment_utils.writer import AsyncWriter
+
+import threading
+import shutil
+import os
+
+if os.path.isdir("./.logs"):
+    shutil.rmtree("./.logs")
+
+# A full queue under "drop_oldest" only sheds calls submitted as droppable,
+# oldest first, and waits when there is none
+writer = AsyncWriter(max_queue_size=4, backpressure="drop_oldest")
+release = threading.Event()
+started = threading.Event()
+ran = []
+
+
+def blocked():
+    started.set()
+    release.wait()
+
+
+writer.submit(blocked)
+started.wait()
+writer.submit(ran.append, "param")
+for i in range(10):
+    writer.submit(ran.append, i, droppable=True)
+writer.submit(ran.append, "flush")
+assert writer.num_dropped == 8, writer.num_dropped
+release.set()
+writer.flush()
+assert ran == ["param", 8, 9, "flush"], ran
+
+# Non-droppable calls block until the writer catches up instead of dropping
+release.clear()
+started.clear()
+writer.submit(blocked)
+started.wait()
+for i in range(4):
+    writer.submit(ran.append, f"flush{i}")
+threading.Timer(0.2, release.set).start()
+writer.submit(ran.append, "last")
+writer.close()
+assert ran[-5:] == ["flush0", "flush1", "flush2", "flush3", "last"], ran
+assert writer.num_dropped == 8
+
+# Through the Logger, params and flushes survive however many values are shed
+logger = experiment_utils.Logger(
+    async_mode=True, max_queue_size=2, backpressure="drop_oldest"
+)
+logger.start_experiment("test")
+for i in range(2000):
+    logger.log_value("value", i, step=i)
+    if i % 100 == 0:
+        logger.log_param(f"param{i}", i)
+        logger.flush()
+experiment_path = logger.experiment_path
+logger.end_experiment()
+
+params = load_experiment(experiment_path)["params"]
+assert params == {f"param{i}": i for i in range(0, 2000, 100)}, params
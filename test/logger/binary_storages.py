@@ -0,0 +1,65 @@
+import experiment_utils
+from experiment_utils.storage import (
+    LogStorage,
+    NumpyStorage,
+    ParquetStorage,
+    get_storage,
+)
+
+import numpy as np
+import shutil
+import os
+
+if os.path.isdir("./.logs"):
+    shutil.rmtree("./.logs")
+
+# Binary storages only hold numbers, rejecting a batch leaves them as they
+# were so appends after it still land
+for storage_class in [ParquetStorage, LogStorage, NumpyStorage]:
+    values_path = os.path.join("./.logs", storage_class.name)
+    storage = storage_class(values_path)
+    storage.append("a", [0], [1.0])
+    try:
+        storage.append("b", [0, 1], [2.0, "x"])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f"{storage_class.name} accepted strings")
+    storage.append("b", [1], [3.0])
+    storage.append("a", [1], [4.0])
+    storage.close()
+    records = storage_class.open(values_path, "a").records()
+    assert records.tolist() == [(0, 1.0), (1, 4.0)], (storage_class.name, records)
+    records = storage_class.open(values_path, "b").records()
+    assert records.tolist() == [(1, 3.0)], (storage_class.name, records)
+
+# The Logger rejects them on the caller's thread, before anything is buffered,
+# also in async mode. None is logged as a missing value
+for storage in ["parquet", "log", "npy"]:
+    for async_mode in [False, True]:
+        logger = experiment_utils.Logger(
+            log_path=f"./.logs/{storage}_logger", storage=storage, async_mode=async_mode
+        )
+        logger.start_experiment("test")
+        for log in [
+            lambda: logger.log_value("status", "done"),
+            lambda: logger.log_values({"loss": 1.0, "status": "done"}, step=0),
+            lambda: logger.log_series("status", [0, 1], ["a", "b"]),
+        ]:
+            try:
+                log()
+            except AssertionError:
+                pass
+            else:
+                raise AssertionError(f"{storage} accepted strings")
+        logger.log_value("loss", 2.0, step=1)
+        logger.log_value("loss", None, step=2)
+        experiment_path = logger.experiment_path
+        logger.close()
+
+        storage_class = get_storage(storage)
+        values_path = os.path.join(experiment_path, "values")
+        assert storage_class.open(values_path, "status") is None
+        records = storage_class.open(values_path, "loss").records()
+        assert records["step"].tolist() == [1, 2], records
+        assert records["value"][0] == 2.0 and np.isnan(records["value"][1]), records
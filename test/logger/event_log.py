@@ -0,0 +1,83 @@
+import experiment_utils
+from experiment_utils import compare_fns
+from experiment_utils.utils import load_experiment
+from experiment_utils.wal import WAL_FILE, CHECKPOINT_FILE, checkpoint_offset
+
+import subprocess
+import shutil
+import math
+import sys
+import os
+
+if os.path.isdir("./.logs"):
+    shutil.rmtree("./.logs")
+
+# A process that dies without ending the experiment leaves its updates since
+# the last compaction in the event log only
+process = subprocess.run(
+    [
+        sys.executable,
+        "-c",
+        "import os, experiment_utils\n"
+        "from experiment_utils import compare_fns\n"
+        "logger = experiment_utils.Logger(wal=True)\n"
+        "logger.start_experiment('test')\n"
+        "logger.log_params({'lr': 0.1, 'epochs': 10})\n"
+        "logger.log_value('loss', 2.0, step=0)\n"
+        "logger.compact()\n"
+        "logger.log_param('lr', 0.01)\n"
+        "logger.log_value('loss', 1.0, step=1)\n"
+        "logger.log_value('accuracy', 0.5, compare_fn=compare_fns.max)\n"
+        "logger.log_value('accuracy', float('nan'), compare_fn=compare_fns.max)\n"
+        "logger.log_value('grad_norm', float('inf'))\n"
+        "logger.log_value('grad_scale', float('nan'))\n"
+        "logger.flush()\n"
+        "print(logger.experiment_id, flush=True)\n"
+        "os._exit(1)\n",
+    ],
+    capture_output=True,
+    text=True,
+)
+assert process.returncode == 1, process.stderr
+experiment_id = process.stdout.strip()
+experiment_path = os.path.join("./.logs", experiment_id)
+
+# Readers replay the events on top of the materialized files, a torn last
+# record is ignored
+with open(os.path.join(experiment_path, WAL_FILE), "ab") as f:
+    f.write(b'{"type": "params", "params": {"lr"')
+experiment = load_experiment(experiment_path)
+assert experiment["params"] == {"epochs": 10, "lr": 0.01}, experiment["params"]
+values = experiment["values"]
+assert values["last_loss"] == 1.0, values
+assert values["best_accuracy"] == 0.5, values
+assert values["last_grad_norm"] == math.inf, values
+assert math.isnan(values["last_grad_scale"]), values
+
+# Resuming picks up the replayed state, ending materializes it and starts the
+# event log over. Ending again does nothing
+logger = experiment_utils.Logger(wal=True)
+logger.resume_experiment(experiment_id)
+logger.log_value("accuracy", 0.4, compare_fn=compare_fns.max)
+logger.log_value("loss", math.nan, step=2)
+logger.end_experiment()
+logger.end_experiment()
+assert os.path.getsize(os.path.join(experiment_path, WAL_FILE)) == 0
+assert checkpoint_offset(experiment_path) == 0
+
+experiment = load_experiment(experiment_path)
+assert experiment["params"] == {"epochs": 10, "lr": 0.01}, experiment["params"]
+values = experiment["values"]
+assert values["best_accuracy"] == 0.5, values
+assert math.isnan(values["last_loss"]), values
+
+# A crash while starting the log over leaves a checkpoint past its end, new
+# events are not hidden behind it
+with open(os.path.join(experiment_path, CHECKPOINT_FILE), "w") as f:
+    f.write('{"offset": 1000}')
+logger.resume_experiment(experiment_id)
+logger.log_value("loss", 0.5, step=3)
+logger.flush()
+assert load_experiment(experiment_path)["values"]["last_loss"] == 0.5
+logger.end_experiment()
+assert load_experiment(experiment_path)["values"]["last_loss"] == 0.5
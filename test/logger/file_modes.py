@@ -0,0 +1,43 @@
+import experiment_utils
+
+import shutil
+import stat
+import os
+
+if os.path.isdir("./.logs"):
+    shutil.rmtree("./.logs")
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+# Files replaced atomically get the mode a plain open() would create, not the
+# private one of their temporary file
+umask = os.umask(0o022)
+try:
+    logger = experiment_utils.Logger()
+    logger.start_experiment("test")
+    logger.log_param("lr", 0.1)
+    logger.log_value("loss", 1.0)
+    logger.end_experiment()
+finally:
+    os.umask(umask)
+
+experiment_path = logger.experiment_path
+files = [
+    os.path.join(experiment_path, name)
+    for name in os.listdir(experiment_path)
+    if os.path.isfile(os.path.join(experiment_path, name))
+]
+assert {"meta.yaml", "params.yaml", "values.yaml"} <= set(map(os.path.basename, files))
+for path in files:
+    assert mode(path) == 0o644, (path, oct(mode(path)))
+
+# Replacing a file keeps the mode it was given
+params_path = os.path.join(experiment_path, "params.yaml")
+os.chmod(params_path, 0o640)
+logger.resume_experiment(os.path.basename(experiment_path))
+logger.log_param("epochs", 10)
+logger.end_experiment()
+assert mode(params_path) == 0o640, oct(mode(params_path))
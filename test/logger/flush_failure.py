@@ -0,0 +1,36 @@
+import experiment_utils
+from experiment_utils.storage import CSVStorage
+from experiment_utils.utils import load_experiment
+
+import shutil
+import os
+
+if os.path.isdir("./.logs"):
+    shutil.rmtree("./.logs")
+
+logger = experiment_utils.Logger(buffer_size=1000)
+logger.start_experiment("test")
+for i in range(10):
+    logger.log_values({"a": i, "b": i, "c": i}, step=i)
+
+# The file of "b" cannot be opened, the flush fails part way through
+values_path = os.path.join(logger.experiment_path, "values")
+os.makedirs(os.path.join(values_path, "b.csv"))
+try:
+    logger.flush()
+except OSError:
+    pass
+else:
+    raise AssertionError("Flushing into a directory succeeded")
+os.rmdir(os.path.join(values_path, "b.csv"))
+
+# The keys before and after the failing one are written exactly once
+logger.log_values({"a": 10, "b": 10, "c": 10}, step=10)
+logger.end_experiment()
+for key in ["a", "c"]:
+    records = CSVStorage.open(values_path, key).records()
+    assert records["step"].tolist() == list(range(11)), (key, records)
+records = CSVStorage.open(values_path, "b").records()
+assert records["step"].tolist() == [10], records
+summary = load_experiment(logger.experiment_path)["values"]
+assert [summary[f"last_{key}"] for key in "abc"] == [10, 10, 10], summary
@@ -0,0 +1,94 @@
+import experiment_utils
+from experiment_utils.storage import (
+    CSVStorage,
+    LogStorage,
+    LOG_DTYPE,
+    LOG_INDEX_DTYPE,
+)
+
+import numpy as np
+import shutil
+import os
+
+if os.path.isdir("./.logs"):
+    shutil.rmtree("./.logs")
+
+num_keys = 100
+num_steps = 1000
+
+loggers = {
+    storage: experiment_utils.Logger(log_path=f"./.logs/{storage}", storage=storage)
+    for storage in ["csv", "log"]
+}
+for logger in loggers.values():
+    logger.start_experiment("test")
+    for i in range(num_steps):
+        logger.log_values({f"layer{j}": i * j / 2 for j in range(num_keys)}, step=i)
+    logger.log_value("no_step", 1)
+    logger.log_value("no_step", 2)
+    logger.end_experiment()
+
+csv_path = os.path.join(loggers["csv"].experiment_path, "values")
+log_path = os.path.join(loggers["log"].experiment_path, "values")
+assert sorted(os.listdir(log_path)) == ["index.bin", "keys.txt", "records.bin"]
+
+# Every series reads back as with one CSV file per key
+for key in ["layer0", "layer57", "layer99", "no_step"]:
+    expected = CSVStorage.open(csv_path, key).records()
+    records = LogStorage.open(log_path, key).records()
+    assert np.array_equal(records, expected), key
+assert LogStorage.open(log_path, "missing") is None
+
+# Unbuffered logging still writes runs of many rows, the index stays small
+index_size = os.path.getsize(os.path.join(log_path, "index.bin"))
+records_size = os.path.getsize(os.path.join(log_path, "records.bin"))
+assert index_size * 100 < records_size, (index_size, records_size)
+
+# Tailing returns what was written since the last call
+records, cursor = LogStorage.tail(log_path, "layer1")
+assert len(records) == num_steps
+logger = loggers["log"]
+logger.resume_experiment(os.path.basename(logger.experiment_path))
+logger.log_value("layer1", -1.0, step=num_steps)
+logger.flush()
+records, cursor = LogStorage.tail(log_path, "layer1", cursor)
+assert records.tolist() == [(num_steps, -1.0)]
+records, cursor = LogStorage.tail(log_path, "layer1", cursor)
+assert len(records) == 0
+logger.end_experiment()
+
+# An interrupted flush leaves partial records, keys and index entries behind,
+# resuming drops them before appending
+sizes = {
+    name: os.path.getsize(os.path.join(log_path, name))
+    for name in ["index.bin", "keys.txt", "records.bin"]
+}
+with open(os.path.join(log_path, "records.bin"), "ab") as f:
+    f.write(b"\0" * 30)
+with open(os.path.join(log_path, "keys.txt"), "ab") as f:
+    f.write(b"partial")
+with open(os.path.join(log_path, "index.bin"), "ab") as f:
+    f.write(b"\0" * 7)
+assert LogStorage.open(log_path, "partial") is None
+assert len(LogStorage.open(log_path, "layer1")) == num_steps + 1
+
+storage = LogStorage(log_path)
+storage.append("layer1", [num_steps + 1], [-2.0])
+storage.close()
+assert os.path.getsize(os.path.join(log_path, "keys.txt")) == sizes["keys.txt"]
+assert os.path.getsize(os.path.join(log_path, "records.bin")) == (
+    sizes["records.bin"] + LOG_DTYPE.itemsize
+)
+assert os.path.getsize(os.path.join(log_path, "index.bin")) == (
+    sizes["index.bin"] + LOG_INDEX_DTYPE.itemsize
+)
+records = LogStorage.open(log_path, "layer1").records()
+assert records[-2:].tolist() == [(num_steps, -1.0), (num_steps + 1, -2.0)]
+
+# A key written without its run counts as a new key on the next resume
+with open(os.path.join(log_path, "keys.txt"), "ab") as f:
+    f.write(b"orphan\n")
+storage = LogStorage(log_path)
+storage.append("orphan", [0], [1.0])
+storage.close()
+assert LogStorage.open(log_path, "orphan").records().tolist() == [(0, 1.0)]
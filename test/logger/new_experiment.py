@@ -1,5 +1,9 @@
 import experiment_utils
+from experiment_utils.storage import CSVStorage
+from experiment_utils.utils import load_experiment
 
+import numpy as np
+import pandas as pd
 import shutil
 import os
 
@@ -57,4 +61,37 @@ for i in range(10):
         compare_fn=experiment_utils.compare_fns.min,
     )
 
+logger.log_series("value7", list(range(10)), [5 * i for i in range(10)])
+logger.log_series(
+    "metric7",
+    np.arange(10),
+    np.array([1.0, np.nan, 3.0, 2.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]),
+    compare_fn=experiment_utils.compare_fns.max,
+)
+logger.log_series("value8", None, pd.Series([1.0, 2.0], index=[3, 4]))
+
+# Invalid steps are rejected before anything is written
+try:
+    logger.log_series("value9", pd.date_range("2024", periods=2), [1.0, 2.0])
+except AssertionError:
+    pass
+else:
+    raise AssertionError("Datetime steps were accepted")
+
+experiment_path = logger.experiment_path
 logger.end_experiment()
+
+values_path = os.path.join(experiment_path, "values")
+records = CSVStorage.open(values_path, "value7").records()
+assert records["step"].tolist() == list(range(10))
+assert records["value"].tolist() == [5 * i for i in range(10)]
+records = CSVStorage.open(values_path, "value8").records()
+assert records.tolist() == [(3, 1.0), (4, 2.0)]
+assert CSVStorage.open(values_path, "value9") is None
+
+summary = load_experiment(experiment_path)["values"]
+assert summary["last_value7"] == 45
+# NaN never becomes the best value
+assert summary["best_metric7"] == 3.0, summary["best_metric7"]
+assert summary["last_value8"] == 2.0
+assert "last_value9" not in summary
@@ -0,0 +1,51 @@
+import experiment_utils
+from experiment_utils import compare_fns
+from experiment_utils.utils import load_experiment
+
+import shutil
+import time
+import os
+
+if os.path.isdir("./.logs"):
+    shutil.rmtree("./.logs")
+
+logger = experiment_utils.Logger()
+logger.start_experiment("test")
+experiment_id = logger.experiment_id
+logger.end_experiment()
+
+shards = {}
+for shard in ["a", "b"]:
+    shards[shard] = experiment_utils.Logger(shard=shard)
+    shards[shard].resume_experiment(experiment_id)
+
+# Shard "b" logs first, so the later "last" value of shard "a" wins even
+# though the shards are read in name order
+shards["b"].log_value("loss", 1.0, step=0)
+shards["b"].log_value("accuracy", 0.9, compare_fn=compare_fns.max)
+shards["b"].log_value("error", 0.3, compare_fn=compare_fns.min)
+shards["b"].log_param("rank_b", 1)
+shards["b"].flush()
+time.sleep(0.01)
+shards["a"].log_value("loss", 2.0, step=1)
+shards["a"].log_value("accuracy", 0.5, compare_fn=compare_fns.max)
+shards["a"].log_value("error", 0.1, compare_fn=compare_fns.min)
+shards["a"].log_param("rank_a", 0)
+for shard in shards.values():
+    shard.end_experiment()
+
+experiment = load_experiment(logger.experiment_path)
+values = experiment["values"]
+assert values["last_loss"] == 2.0, values
+assert values["best_accuracy"] == 0.9, values
+assert values["best_error"] == 0.1, values
+assert experiment["params"] == {"rank_a": 0, "rank_b": 1}, experiment["params"]
+
+# A shard resuming later logs the most recent "last" value again
+time.sleep(0.01)
+shards["b"].resume_experiment(experiment_id)
+shards["b"].log_value("loss", 3.0, step=2)
+shards["b"].end_experiment()
+values = load_experiment(logger.experiment_path)["values"]
+assert values["last_loss"] == 3.0, values
+assert values["best_accuracy"] == 0.9, values